@@ -1,10 +1,23 @@
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import get_settings
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, future=True)
+
+def _json_serializer(obj) -> str:
+    # orjson for JSON/JSONB columns (import previews, raw payloads); non-str keys
+    # are stringified like json.dumps does
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+engine = create_engine(
+    settings.database_url,
+    future=True,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 
 Base = declarative_base()
@@ -1,7 +1,7 @@
 from datetime import datetime
 from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship
 
 from app.core.database import Base
 
@@ -39,7 +39,8 @@ class AdminRun(Base):
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
 
     # Relationship
-    source = relationship("AdminSource", backref="runs", passive_deletes=True)
+    # passive_deletes on the runs collection: rely on ON DELETE CASCADE instead of loading children
+    source = relationship("AdminSource", backref=backref("runs", passive_deletes=True))
 
     __table_args__ = (
         Index("ix_admin_runs_source_created", "source_id", "created_at"),
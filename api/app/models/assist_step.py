@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text, Index
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -26,3 +26,7 @@ class AssistStep(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
     case = relationship("AssistCase", back_populates="steps")
+
+    __table_args__ = (
+        Index("ix_assist_steps_case_step_key", "case_id", "step_key"),
+    )
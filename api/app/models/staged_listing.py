@@ -1,6 +1,6 @@
 from datetime import datetime
 from sqlalchemy import Column, Integer, String, DateTime, Text, Numeric, ForeignKey, UniqueConstraint, Index, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship
 
 from app.core.database import Base
 
@@ -46,7 +46,7 @@ class StagedListing(Base):
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    run = relationship("AdminRun", backref="staged_items", passive_deletes=True)
+    run = relationship("AdminRun", backref=backref("staged_items", passive_deletes=True))
     attributes = relationship("StagedListingAttribute", back_populates="listing", cascade="all, delete-orphan", passive_deletes=True)
 
     __table_args__ = (
@@ -3,12 +3,11 @@ import re
 import time
 from dataclasses import dataclass
 from datetime import datetime
-from html import unescape
-from html.parser import HTMLParser
 from typing import Any, Dict, List, Tuple
 from urllib.parse import urlencode, urljoin, urlparse
 
 import httpx
+from selectolax.lexbor import LexborHTMLParser
 
 from app.core.config import Settings
 
@@ -25,36 +24,6 @@ class _DomainLimit:
     count: int
 
 
-class _AnchorExtractor(HTMLParser):
-    """
-    Minimal HTML anchor extractor to avoid heavy dependencies.
-    """
-
-    def __init__(self):
-        super().__init__()
-        self.links: list[tuple[str, str]] = []
-        self._current_href: str | None = None
-        self._current_text: list[str] = []
-
-    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]):
-        if tag.lower() == "a":
-            href = dict(attrs).get("href")
-            if href:
-                self._current_href = href
-                self._current_text = []
-
-    def handle_endtag(self, tag: str):
-        if tag.lower() == "a" and self._current_href:
-            text = unescape("".join(self._current_text)).strip()
-            self.links.append((self._current_href, text))
-            self._current_href = None
-            self._current_text = []
-
-    def handle_data(self, data: str):
-        if self._current_href:
-            self._current_text.append(data)
-
-
 class WebCrawlOnDemandProvider:
     """
     Async crawl provider; returns metadata only and defers actual crawl to Celery.
@@ -68,6 +37,18 @@ class WebCrawlOnDemandProvider:
         self.settings = settings
         self.config = config or {}
         self.enabled = bool(self._allowlist())
+        self._client: httpx.Client | None = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
 
     def search_listings(
         self,
@@ -91,6 +72,19 @@ class WebCrawlOnDemandProvider:
         }
 
     # ---------- Helpers used by the Celery task ----------
+    def _http_client(self) -> httpx.Client:
+        # Lazy: providers are also built per search request, where nothing is fetched.
+        # One pooled HTTP/2 client per crawl reuses connections across allowlist URLs.
+        if self._client is None:
+            self._client = httpx.Client(
+                http2=True,
+                headers={"User-Agent": "TopFuelAuto/1.0 (+https://topfuelauto.com)"},
+                timeout=10.0,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=20),
+            )
+        return self._client
+
     def _rate_limiter(self):
         per_minute = max(1, self._config_value("rate_per_minute", self.settings.crawl_search_rate_per_minute))
         window_ms = 60_000
@@ -136,12 +130,7 @@ class WebCrawlOnDemandProvider:
                 continue
 
             try:
-                resp = httpx.get(
-                    filled,
-                    headers={"User-Agent": "TopFuelAuto/1.0 (+https://topfuelauto.com)"},
-                    timeout=10.0,
-                    follow_redirects=True,
-                )
+                resp = self._http_client().get(filled)
             except Exception as exc:  # noqa: BLE001
                 logger.warning("Crawl fetch failed: domain=%s error=%s", domain, exc)
                 continue
@@ -150,9 +139,14 @@ class WebCrawlOnDemandProvider:
                 logger.warning("Crawl blocked: domain=%s status=%s", domain, resp.status_code)
                 continue
 
-            content_type = resp.headers.get("content-type", "")
+            # Decide on the header before touching resp.text so non-HTML bodies are never decoded;
+            # only responses without a content-type are sniffed
+            content_type = resp.headers.get("content-type", "").lower()
+            if content_type and "text/html" not in content_type:
+                logger.info("Crawl skipped non-HTML response domain=%s", domain)
+                continue
             body = resp.text or ""
-            if "text/html" not in content_type.lower() and "<html" not in body.lower():
+            if not content_type and "<html" not in body.lower():
                 logger.info("Crawl skipped non-HTML response domain=%s", domain)
                 continue
 
@@ -168,12 +162,14 @@ class WebCrawlOnDemandProvider:
 
     @staticmethod
     def _extract_links(html: str, base_url: str | None = None) -> list[tuple[str, str]]:
-        parser = _AnchorExtractor()
-        parser.feed(html)
+        # selectolax (lexbor, C) instead of a pure-Python HTMLParser walk
+        tree = LexborHTMLParser(html)
         links = []
-        for href, text in parser.links:
+        for anchor in tree.css("a[href]"):
+            href = anchor.attributes.get("href")
             if not href:
                 continue
+            text = anchor.text(deep=True).strip()
             links.append((href, text or "Listing"))
         return links
 
@@ -3,6 +3,7 @@
 import logging
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
@@ -18,7 +19,11 @@ from app.schemas.search_field import (
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1/admin/search/fields", tags=["admin", "search-fields"])
+router = APIRouter(
+    prefix="/api/v1/admin/search/fields",
+    tags=["admin", "search-fields"],
+    default_response_class=ORJSONResponse,
+)
 
 
 @router.get("", response_model=List[SearchFieldResponse])
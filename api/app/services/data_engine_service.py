@@ -475,28 +475,22 @@ def delete_source(db: Session, source_id: int) -> bool:
     Uses SQLAlchemy Core DELETE to allow database CASCADE constraints to work.
     ORM delete() tries to SET NULL on child FKs before deleting parent, which fails
     because source_id is NOT NULL. Core DELETE bypasses ORM and lets DB handle CASCADE.
+    RETURNING reports the deleted row, so no existence SELECT is issued beforehand.
     """
     try:
-        # First check if source exists and get metadata for logging
-        db_source = get_source(db, source_id)
-        if db_source:
-            source_key = db_source.key
-            logger.info(f"Deleting source {source_id} ({source_key})")
-        else:
-            logger.warning(f"delete_source: source_id={source_id} not found")
-            return False
-
-        # Use Core DELETE statement to allow DB CASCADE to work
-        # This bypasses ORM relationship handling that tries to NULL FKs
-        stmt = delete(AdminSource).where(AdminSource.id == source_id)
-        result = db.execute(stmt)
+        stmt = (
+            delete(AdminSource)
+            .where(AdminSource.id == source_id)
+            .returning(AdminSource.id, AdminSource.key)
+        )
+        row = db.execute(stmt).first()
         db.commit()
 
-        if result.rowcount == 0:
-            logger.warning(f"delete_source: source_id={source_id} not found (rowcount=0)")
+        if row is None:
+            logger.warning(f"delete_source: source_id={source_id} not found")
             return False
 
-        logger.info(f"Successfully deleted source {source_id} (rowcount={result.rowcount})")
+        logger.info(f"Successfully deleted source {source_id} ({row.key})")
         return True
     except Exception as e:
         logger.error(f"Error deleting source {source_id}: {type(e).__name__}: {e}")
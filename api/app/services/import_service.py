@@ -1,12 +1,17 @@
 """Service for CSV import processing."""
 
+import codecs
 import csv
 import hashlib
 import io
 import logging
+from functools import lru_cache
+from itertools import islice
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 
@@ -16,35 +21,92 @@ from app.models.merged_listing_attribute import MergedListingAttribute
 
 logger = logging.getLogger(__name__)
 
+# Target fields every column mapping must include ('url' -> canonical_url)
+_REQUIRED_FIELDS = frozenset({"url"})
+
 
 def compute_sha256(data: bytes) -> str:
     """Compute SHA256 hash of file data."""
-    return hashlib.sha256(data).hexdigest()
+    h = hashlib.sha256()
+    h.update(memoryview(data))  # hash the buffer in place, no intermediate copy
+    return h.hexdigest()
+
+
+def compute_content_hash(data: bytes) -> str:
+    """
+    Compute a 256-bit BLAKE2b content hash (64 hex chars).
+
+    Faster than SHA256 on CPUs without SHA extensions. For internal content
+    addressing only; AdminImport.sha256 keeps using compute_sha256.
+    """
+    h = hashlib.blake2b(digest_size=32)
+    h.update(memoryview(data))
+    return h.hexdigest()
 
 
 def detect_csv_structure(file_data: bytes, preview_rows: int = 20) -> Tuple[List[str], List[Dict[str, Any]], int]:
     """
     Parse CSV and detect headers, preview rows, and total row count.
 
+    Streams PyArrow's C++ CSV reader (all columns read as strings); only the
+    preview rows are converted to Python. Falls back to the csv module for
+    input Arrow rejects (non-UTF-8 bytes, ragged rows).
+
     Returns:
         (headers, preview_rows, total_rows)
     """
+    try:
+        return _detect_csv_structure_arrow(file_data, preview_rows)
+    except (pa.ArrowInvalid, UnicodeDecodeError, csv.Error) as e:
+        logger.info(f"Arrow CSV parse failed, falling back to csv module: {e}")
+        return _detect_csv_structure_stdlib(file_data, preview_rows)
+
+
+def _detect_csv_structure_arrow(file_data: bytes, preview_rows: int) -> Tuple[List[str], List[Dict[str, Any]], int]:
+    start = len(codecs.BOM_UTF8) if file_data.startswith(codecs.BOM_UTF8) else 0
+    data = memoryview(file_data)[start:]
+
+    # Header row via csv module so column names (and their string types) are known up front
+    header_end = file_data.find(b"\n", start)
+    header_line = file_data[start:header_end if header_end != -1 else None].decode("utf-8")
+    headers = next(csv.reader([header_line.rstrip("\r")]), [])
+    if not headers:
+        return [], [], 0
+
+    # Stream record batches: only preview rows become Python objects, the rest are just counted
+    reader = pacsv.open_csv(
+        pa.BufferReader(pa.py_buffer(data)),
+        read_options=pacsv.ReadOptions(column_names=headers, skip_rows=1),
+        convert_options=pacsv.ConvertOptions(
+            column_types={h: pa.string() for h in headers},
+            strings_can_be_null=False,
+        ),
+    )
+    preview: List[Dict[str, Any]] = []
+    total_count = 0
+    for batch in reader:
+        if len(preview) < preview_rows:
+            preview.extend(batch.slice(0, preview_rows - len(preview)).to_pylist())
+        total_count += batch.num_rows
+
+    return headers, preview, total_count
+
+
+def _detect_csv_structure_stdlib(file_data: bytes, preview_rows: int) -> Tuple[List[str], List[Dict[str, Any]], int]:
     # Decode with BOM handling
     try:
-        text = file_data.decode('utf-8-sig')  # Handles UTF-8 BOM
+        return _scan_csv_text(file_data, 'utf-8-sig', preview_rows)  # Handles UTF-8 BOM
     except UnicodeDecodeError:
-        text = file_data.decode('latin-1')  # Fallback
+        return _scan_csv_text(file_data, 'latin-1', preview_rows)  # Fallback
 
-    reader = csv.DictReader(io.StringIO(text))
-    headers = reader.fieldnames or []
 
-    preview = []
-    total_count = 0
+def _scan_csv_text(file_data: bytes, encoding: str, preview_rows: int) -> Tuple[List[str], List[Dict[str, Any]], int]:
+    # Decode incrementally instead of building one str for the whole upload
+    reader = csv.DictReader(io.TextIOWrapper(io.BytesIO(file_data), encoding=encoding, newline=''))
+    headers = reader.fieldnames or []
 
-    for i, row in enumerate(reader):
-        total_count += 1
-        if i < preview_rows:
-            preview.append(dict(row))
+    preview = [dict(row) for row in islice(reader, preview_rows)]
+    total_count = len(preview) + sum(1 for _ in reader)
 
     return headers, preview, total_count
 
@@ -68,57 +130,69 @@ def suggest_column_mapping(headers: List[str]) -> Dict[str, str]:
 
     Returns dict: {csv_column: target_field}
     """
-    mapping = {}
+    # Re-uploads of the same export share a header row; cache per header tuple
+    # and hand back a copy so callers can edit the mapping freely.
+    return dict(_suggest_column_mapping_cached(tuple(headers)))
+
+
+# Mapping rules (case-insensitive matching)
+_MAPPING_RULES = {
+    # URL (required)
+    "url": ["url", "lot url", "link", "listing url", "listing_url"],
+
+    # Basic fields
+    "year": ["year"],
+    "make": ["make", "manufacturer"],
+    "model": ["model"],
 
-    # Mapping rules (case-insensitive matching)
-    rules = {
-        # URL (required)
-        "url": ["url", "lot url", "link", "listing url", "listing_url"],
+    # Price
+    "price": ["price", "current bid", "current_bid", "bid", "sale price", "sale_price"],
 
-        # Basic fields
-        "year": ["year"],
-        "make": ["make", "manufacturer"],
-        "model": ["model"],
+    # Identifiers
+    "external_id": ["lot", "lot/inv #", "lot_inv", "lot #", "lot_number", "inv", "inventory"],
 
-        # Price
-        "price": ["price", "current bid", "current_bid", "bid", "sale price", "sale_price"],
+    # Odometer
+    "mileage": ["odometer", "mileage", "miles", "km"],
 
-        # Identifiers
-        "external_id": ["lot", "lot/inv #", "lot_inv", "lot #", "lot_number", "inv", "inventory"],
+    # Location
+    "location": ["location", "sale name", "sale_name", "site", "yard"],
 
-        # Odometer
-        "mileage": ["odometer", "mileage", "miles", "km"],
+    # Date
+    "sale_date": ["sale date", "sale_date", "auction date", "auction_date", "date"],
 
-        # Location
-        "location": ["location", "sale name", "sale_name", "site", "yard"],
+    # Title
+    "title": ["title", "description", "name"],
 
-        # Date
-        "sale_date": ["sale date", "sale_date", "auction date", "auction_date", "date"],
+    # VIN
+    "vin": ["vin", "vin #", "vin_number"],
 
-        # Title
-        "title": ["title", "description", "name"],
+    # Retail value
+    "retail_value": ["est. retail value", "est retail value", "retail value", "retail_value", "estimated value"],
 
-        # VIN
-        "vin": ["vin", "vin #", "vin_number"],
+    # Damage
+    "damage": ["damage", "damage description", "damage_description"],
 
-        # Retail value
-        "retail_value": ["est. retail value", "est retail value", "retail value", "retail_value", "estimated value"],
+    # Title code
+    "title_code": ["title code", "title_code", "title status", "title_status"],
+}
 
-        # Damage
-        "damage": ["damage", "damage description", "damage_description"],
+# Inverted once at import: exact lowercase header -> target field. The first
+# rule listing a pattern wins, matching the order rules are checked in.
+_PATTERN_TO_FIELD: Dict[str, str] = {}
+for _target_field, _patterns in _MAPPING_RULES.items():
+    for _pattern in _patterns:
+        _PATTERN_TO_FIELD.setdefault(_pattern, _target_field)
 
-        # Title code
-        "title_code": ["title code", "title_code", "title status", "title_status"],
-    }
+
+@lru_cache(maxsize=256)
+def _suggest_column_mapping_cached(headers: Tuple[str, ...]) -> Dict[str, str]:
+    mapping = {}
 
     # Match headers to target fields
     for csv_col in headers:
-        lower_col = csv_col.lower().strip()
-
-        for target_field, patterns in rules.items():
-            if lower_col in patterns:
-                mapping[csv_col] = target_field
-                break
+        target_field = _PATTERN_TO_FIELD.get(csv_col.lower().strip())
+        if target_field:
+            mapping[csv_col] = target_field
 
     return mapping
 
@@ -223,9 +297,10 @@ def validate_column_mapping(column_map: Dict[str, str]) -> None:
     Raises ValueError if validation fails.
     """
     # Check that at least 'url' is mapped
-    target_fields = set(column_map.values())
+    missing = _REQUIRED_FIELDS.difference(column_map.values())
 
-    if "url" not in target_fields:
-        raise ValueError("Required field 'url' must be mapped (for canonical_url)")
+    if missing:
+        fields = ", ".join(f"'{field}'" for field in sorted(missing))
+        raise ValueError(f"Required field {fields} must be mapped (for canonical_url)")
 
     logger.info(f"Column mapping validated: {len(column_map)} columns mapped")
@@ -12,6 +12,10 @@ from ..fetchers.curl_fetcher import CurlFetcher
 
 logger = logging.getLogger(__name__)
 
+# VIN format excludes I, O, Q to avoid confusion with 1, 0
+_VIN_RE = re.compile(r'VIN:\s*([A-HJ-NPR-Z0-9]{17})', re.IGNORECASE)
+_VIN_EXCLUDED_CHARS = frozenset("IOQ")
+
 
 class BidfaxHtmlProvider:
     """
@@ -125,7 +129,7 @@ class BidfaxHtmlProvider:
         Bidfax structure:
         - Cards: div.thumbnail.offer
         - Price: span.prices
-        - VIN: h2 title (regex extraction)
+        - VIN: h2 title ("VIN:" + 17-char token)
         - Lot: "Lot number:" label + span.blackfont
         - Source: span.copart or span.iaai
         - Status: img[alt] (Sold/On approval/No sale)
@@ -140,7 +144,13 @@ class BidfaxHtmlProvider:
         Returns:
             List of parsed sold result dictionaries
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        # Empty/blocked responses: skip parser setup when no card class is present
+        # (substring probe; class order inside the attribute does not matter)
+        if not html or 'thumbnail' not in html:
+            logger.info(f"No offer cards on {url} (empty or card-less HTML)")
+            return []
+
+        soup = BeautifulSoup(html, 'lxml')
         results = []
 
         # Find all offer cards
@@ -182,11 +192,9 @@ class BidfaxHtmlProvider:
             title_text = title_elem.get_text(strip=True)
             result["title"] = title_text
 
-            # Regex: VIN:\s*([A-HJ-NPR-Z0-9]{17})
-            # VIN format excludes I, O, Q to avoid confusion with 1, 0
-            vin_match = re.search(r'VIN:\s*([A-HJ-NPR-Z0-9]{17})', title_text, re.IGNORECASE)
-            if vin_match:
-                result["vin"] = vin_match.group(1).upper()
+            vin = self._extract_vin(title_text)
+            if vin:
+                result["vin"] = vin
 
         # Extract sold price from span.prices
         price_elem = card.select_one('span.prices')
@@ -269,6 +277,35 @@ class BidfaxHtmlProvider:
 
         return result
 
+    def _extract_vin(self, title: str) -> Optional[str]:
+        """
+        Extract VIN from a card title like '2015 FORD C-MAX VIN: 1FADP5AU1FL123456'.
+
+        Slices the 17 characters after 'VIN:' and validates them directly,
+        falling back to the regex only for non-standard formats.
+
+        Args:
+            title: Card title text
+
+        Returns:
+            Uppercase VIN, or None if not found
+        """
+        idx = title.find('VIN:')
+        if idx >= 0:
+            candidate = title[idx + 4:].lstrip()[:17].upper()
+            if (
+                len(candidate) == 17
+                and candidate.isascii()
+                and candidate.isalnum()
+                and not _VIN_EXCLUDED_CHARS.intersection(candidate)
+            ):
+                return candidate
+
+        vin_match = _VIN_RE.search(title)
+        if vin_match:
+            return vin_match.group(1).upper()
+        return None
+
     def _parse_price(self, text: str) -> Optional[int]:
         """
         Parse price from text like '$12,500' to cents.
@@ -324,6 +361,11 @@ class BidfaxHtmlProvider:
             datetime object, or None if parsing fails
         """
         try:
+            # Fast path for the fixed DD.MM.YYYY shape: slice and build directly
+            # instead of re-parsing a format string; datetime() rejects
+            # out-of-range values like 32.13.2025.
+            if len(text) == 10 and text[2] == '.' and text[5] == '.':
+                return datetime(int(text[6:10]), int(text[3:5]), int(text[0:2]))
             return datetime.strptime(text, '%d.%m.%Y')
         except ValueError:
             return None
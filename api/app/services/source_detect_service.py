@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Any, Callable, Optional, Tuple
 from urllib.parse import urljoin
 from urllib.parse import urlparse
@@ -11,6 +12,7 @@ import re
 
 import httpx
 from bs4 import BeautifulSoup
+import soupsieve
 from sqlalchemy.orm import Session
 
 from app.models.admin_source import AdminSource
@@ -22,6 +24,12 @@ logger = logging.getLogger(__name__)
 HTML_TOO_SMALL_THRESHOLD = 1000
 
 
+@lru_cache(maxsize=512)
+def _css(selector: str) -> soupsieve.SoupSieve:
+    # Candidate selectors are probed against every node of every page; compile each once.
+    return soupsieve.compile(selector)
+
+
 @dataclass(frozen=True)
 class FetchAttempt:
     method: str
@@ -175,7 +183,7 @@ def _compute_signals(html: str) -> dict[str, Any]:
     )
 
     nextjs_score = 0.0
-    if soup is not None and soup.select_one("script#__NEXT_DATA__") is not None:
+    if soup is not None and _css("script#__NEXT_DATA__").select_one(soup) is not None:
         nextjs_score = 1.0
     elif "__next_data__" in lower:
         nextjs_score = 0.6
@@ -202,7 +210,7 @@ def _compute_signals(html: str) -> dict[str, Any]:
         item_candidates = [*item_candidates, *_candidate_selectors_from_product_links(soup)]
         for sel in item_candidates:
             try:
-                nodes = soup.select(sel)
+                nodes = _css(sel).select(soup)
             except Exception:
                 continue
             if not nodes:
@@ -215,7 +223,7 @@ def _compute_signals(html: str) -> dict[str, Any]:
     # Pagination score: simple signals; 0..1
     pagination_score = 0.0
     if soup is not None:
-        if soup.select_one("a[rel='next'], link[rel='next']") is not None:
+        if _css("a[rel='next'], link[rel='next']").select_one(soup) is not None:
             pagination_score = 1.0
         else:
             hrefs = []
@@ -851,7 +859,7 @@ def _item_nodes_metrics(nodes: list[Any]) -> dict[str, float | int]:
         try:
             if node.find(["h1", "h2", "h3", "h4"]) is not None:
                 title_hits += 1
-            elif node.select_one(".name, .title, .product-title, .product__title") is not None:
+            elif _css(".name, .title, .product-title, .product__title").select_one(node) is not None:
                 title_hits += 1
         except Exception:
             pass
@@ -883,7 +891,7 @@ def _pick_best_item_selector(soup: BeautifulSoup, candidates: list[str]) -> Opti
     best_score = 0.0
     for sel in candidates:
         try:
-            nodes = soup.select(sel)
+            nodes = _css(sel).select(soup)
         except Exception:
             continue
         if not nodes:
@@ -933,7 +941,7 @@ def _pick_best_field_selector(
         hits = 0
         for node in sample:
             try:
-                target = node.select_one(sel)
+                target = _css(sel).select_one(node)
             except Exception:
                 target = None
             if target is None:
@@ -991,7 +999,7 @@ def _suggest_generic_html_list_extract(
     item_nodes: list[Any] = []
     if item_selector:
         try:
-            item_nodes = soup.select(item_selector)
+            item_nodes = _css(item_selector).select(soup)
         except Exception:
             item_nodes = []
 
@@ -1042,7 +1050,7 @@ def _suggest_generic_html_list_extract(
     next_page_selector: Optional[str] = None
     for sel in next_page_candidates:
         try:
-            a = soup.select_one(sel)
+            a = _css(sel).select_one(soup)
         except Exception:
             a = None
         if a is not None and a.get("href"):
@@ -1095,7 +1103,7 @@ def _count_field_hits(
     sample = item_nodes[: min(len(item_nodes), 25)]
     for node in sample:
         try:
-            target = node.select_one(selector)
+            target = _css(selector).select_one(node)
         except Exception:
             target = None
         if target is None:
@@ -1130,7 +1138,7 @@ def _suggest_woocommerce_extract(soup: BeautifulSoup, *, used_url: str) -> tuple
 
     item_selector = "li.product, .products .product, ul.products li.product"
     try:
-        item_nodes = soup.select(item_selector)
+        item_nodes = _css(item_selector).select(soup)
     except Exception:
         item_nodes = []
 
@@ -6,11 +6,13 @@ import logging
 import re
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
-from typing import Dict, Any, Optional
+from itertools import islice
+from typing import Dict, Any, List, Optional
 
+import pandas as pd
 from sqlalchemy.orm import Session
 
-from app.core.database import SessionLocal
+from app.core.database import SessionLocal, _json_serializer
 from app.models.admin_import import AdminImport
 from app.models.merged_listing import MergedListing
 from app.models.merged_listing_attribute import MergedListingAttribute
@@ -21,6 +23,16 @@ logger = logging.getLogger(__name__)
 
 BATCH_SIZE = 500  # Commit every 500 rows
 
+# Compiled once at import; parse_price/parse_mileage run per CSV row
+_PRICE_STRIP_RE = re.compile(r'[^\d,.]')
+_MILEAGE_RE = re.compile(r'([\d,]+)')
+
+# float64 holds every integer below 2**53 exactly; larger readings go to parse_mileage
+_FLOAT_EXACT_INT_LIMIT = 2 ** 53
+
+# Marks a value the series parsers left for the per-row parser
+_NOT_PREPARSED = object()
+
 
 def parse_price(value: str) -> Optional[Decimal]:
     """
@@ -33,7 +45,7 @@ def parse_price(value: str) -> Optional[Decimal]:
         return None
 
     # Remove currency symbols and words
-    cleaned = re.sub(r'[^\d,.]', '', value)
+    cleaned = _PRICE_STRIP_RE.sub('', value)
     # Remove commas
     cleaned = cleaned.replace(',', '')
 
@@ -55,7 +67,7 @@ def parse_mileage(value: str) -> Optional[int]:
         return None
 
     # Extract numeric part
-    match = re.match(r'([\d,]+)', value)
+    match = _MILEAGE_RE.match(value)
     if match:
         numeric = match.group(1).replace(',', '')
         try:
@@ -116,6 +128,54 @@ def parse_sale_date(value: str) -> Optional[datetime]:
     return None
 
 
+def _parse_price_series(values: pd.Series) -> pd.Series:
+    """Vectorized parse_price over a column of stripped strings."""
+    cleaned = values.str.replace(r'[^\d.]', '', regex=True)
+    valid = pd.to_numeric(cleaned, errors='coerce').notna()
+    for value in values[~valid & ~values.isin(('', 'N/A', 'NULL'))]:
+        logger.warning(f"Failed to parse price: {value}")
+    # Decimal from the cleaned text (not the float) keeps cents exact
+    return cleaned.where(valid).map(Decimal, na_action='ignore').astype(object).where(valid, None)
+
+
+def _parse_mileage_series(values: pd.Series) -> pd.Series:
+    """Vectorized parse_mileage over a column of stripped strings."""
+    numeric = values.str.extract(r'^([\d,]+)', expand=False).str.replace(',', '', regex=False)
+    miles = pd.to_numeric(numeric, errors='coerce')
+    exact = ~(miles >= _FLOAT_EXACT_INT_LIMIT)
+    # Exclude non-actual (N) and exempt (E) readings
+    valid = (miles > 0) & exact & ~values.str.contains(r'[NE]', regex=True)
+    parsed = miles.where(valid).astype('Int64').astype(object).where(valid, None)
+    return parsed.where(exact, _NOT_PREPARSED)
+
+
+def _parse_year_series(values: pd.Series) -> pd.Series:
+    """Vectorized parse_year over a column of stripped strings."""
+    digits = values.where(values.str.fullmatch(r'[+-]?\d+'))
+    years = pd.to_numeric(digits, errors='coerce')
+    # Sanity check (1900-2030)
+    valid = years.between(1900, 2030)
+    return years.where(valid).astype('Int64').astype(object).where(valid, None)
+
+
+_SERIES_PARSERS = {
+    ('integer', 'year'): _parse_year_series,
+    ('integer', 'mileage'): _parse_mileage_series,
+    ('decimal', 'price'): _parse_price_series,
+}
+
+
+def _map_headers_to_fields(search_fields: List[SearchField], headers) -> Dict[str, SearchField]:
+    """Build mapping: CSV header -> SearchField (first matching alias wins)."""
+    csv_to_field = {}
+    for field in search_fields:
+        for alias in field.source_aliases:
+            if alias in headers:
+                csv_to_field[alias] = field
+                break
+    return csv_to_field
+
+
 def build_listing_from_row(
     row: Dict[str, str],
     column_map: Dict[str, str],
@@ -128,20 +188,64 @@ def build_listing_from_row(
     Returns:
         (listing_fields, extra_fields, raw_payload)
     """
-    listing_fields = {}
-    extra_fields = {}
-    raw_payload = dict(row)  # Store original CSV row for backfill
-
     # Load search fields registry (cached per import)
     search_fields = db.query(SearchField).filter(SearchField.enabled == True).all()
+    csv_to_field = _map_headers_to_fields(search_fields, row)
 
-    # Build mapping: CSV header -> SearchField
-    csv_to_field = {}
-    for field in search_fields:
-        for alias in field.source_aliases:
-            if alias in row:
-                csv_to_field[alias] = field
-                break
+    return _build_listing(row, column_map, source_key, csv_to_field, {})
+
+
+def build_listings_from_rows(
+    rows: List[Dict[str, str]],
+    column_map: Dict[str, str],
+    source_key: str,
+    db: Session
+) -> List[tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]]:
+    """
+    Batch variant of build_listing_from_row.
+
+    Loads the search_fields registry once and parses the year, mileage and
+    price columns as whole pandas columns instead of row by row. Rows are
+    expected to share headers (as produced by csv.DictReader).
+
+    Returns:
+        One (listing_fields, extra_fields, raw_payload) tuple per row
+    """
+    if not rows:
+        return []
+
+    search_fields = db.query(SearchField).filter(SearchField.enabled == True).all()
+    frame = pd.DataFrame(rows, dtype=object)
+    csv_to_field = _map_headers_to_fields(search_fields, frame.columns)
+
+    parsed_columns = {}
+    for csv_header, field in csv_to_field.items():
+        parser = _SERIES_PARSERS.get((field.data_type, field.key))
+        if parser:
+            values = frame[csv_header].fillna('').astype(str).str.strip()
+            parsed_columns[csv_header] = parser(values)
+
+    if parsed_columns:
+        preparsed_rows = pd.DataFrame(parsed_columns, dtype=object).to_dict('records')
+    else:
+        preparsed_rows = [{}] * len(rows)
+
+    return [
+        _build_listing(row, column_map, source_key, csv_to_field, preparsed)
+        for row, preparsed in zip(rows, preparsed_rows)
+    ]
+
+
+def _build_listing(
+    row: Dict[str, str],
+    column_map: Dict[str, str],
+    source_key: str,
+    csv_to_field: Dict[str, SearchField],
+    preparsed: Dict[str, Any],
+) -> tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    listing_fields = {}
+    extra_fields = {}
+    raw_payload = dict(row)  # Store original CSV row for backfill
 
     # Reverse mapping from old column_map (for backwards compatibility)
     reverse_map = {v: k for k, v in column_map.items()}
@@ -168,8 +272,11 @@ def build_listing_from_row(
             continue
 
         # Parse value based on data_type
+        preparsed_value = preparsed.get(csv_header, _NOT_PREPARSED)
         parsed_value = None
-        if field.data_type == 'integer':
+        if preparsed_value is not _NOT_PREPARSED:
+            parsed_value = preparsed_value
+        elif field.data_type == 'integer':
             if field.key in ['year', 'mileage']:
                 parsed_value = parse_year(value) if field.key == 'year' else parse_mileage(value)
             else:
@@ -227,6 +334,127 @@ def build_listing_from_row(
     return listing_fields, extra_fields, raw_payload
 
 
+_COPY_COLUMNS = (
+    'source_key', 'source_listing_id', 'canonical_url', 'title',
+    'year', 'make', 'model', 'price_amount', 'currency',
+    'odometer_value', 'location', 'sale_datetime', 'fetched_at', 'status',
+    'merged_at', 'created_at', 'updated_at', 'extra', 'raw_payload',
+)
+_JSON_COPY_COLUMNS = frozenset({'extra', 'raw_payload'})
+
+
+def _copy_text_value(column: str, value: Any) -> str:
+    """Encode one value for COPY ... FROM STDIN (text format)."""
+    if value is None:
+        return '\\N'
+    if column in _JSON_COPY_COLUMNS:
+        # Same encoder as the engine's JSONB columns, so COPY and ORM rows match
+        value = _json_serializer(value)
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def bulk_insert_listings(db: Session, listings: List[Dict[str, Any]]) -> int:
+    """
+    Insert new MergedListing rows with a single PostgreSQL COPY.
+
+    Runs on the session's connection, so rows commit with the session. Column
+    defaults normally applied by the ORM (timestamps, extra) are filled here.
+
+    Returns:
+        Number of rows inserted
+    """
+    if not listings:
+        return 0
+
+    now = datetime.utcnow()
+    buf = io.StringIO()
+    for listing in listings:
+        row = {'merged_at': now, 'created_at': now, 'updated_at': now, 'extra': {}, **listing}
+        buf.write('\t'.join(_copy_text_value(col, row.get(col)) for col in _COPY_COLUMNS))
+        buf.write('\n')
+    buf.seek(0)
+
+    # psycopg2 connection behind the session's current transaction
+    dbapi_conn = db.connection().connection
+    with dbapi_conn.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {MergedListing.__tablename__} ({', '.join(_COPY_COLUMNS)}) FROM STDIN",
+            buf,
+        )
+    return len(listings)
+
+
+def _insert_new_listings(
+    db: Session,
+    admin_import: AdminImport,
+    batch: Dict[str, tuple[int, Dict[str, Any]]],
+    errors: List[str],
+) -> None:
+    """
+    Insert and clear the batched new listings, counting them as created.
+
+    The batch is COPYed inside a savepoint. If that fails, it is inserted again
+    one row per savepoint, so only the rows that fail on their own are recorded
+    as errors against their CSV row number.
+    """
+    entries = list(batch.values())
+    batch.clear()
+    if not entries:
+        return
+
+    try:
+        with db.begin_nested():
+            inserted = bulk_insert_listings(db, [listing for _, listing in entries])
+    except Exception as e:
+        logger.warning(f"Batch insert failed ({type(e).__name__}: {e}), inserting {len(entries)} rows one by one")
+    else:
+        admin_import.created_count += inserted
+        return
+
+    for row_num, listing in entries:
+        try:
+            with db.begin_nested():
+                inserted = bulk_insert_listings(db, [listing])
+        except Exception as e:
+            error_msg = f"Row {row_num}: {type(e).__name__}: {e}"
+            errors.append(error_msg)
+            logger.error(error_msg)
+            admin_import.error_count += 1
+            admin_import.processed_rows -= 1
+        else:
+            admin_import.created_count += inserted
+
+
+def _iter_built_listings(reader, column_map: Dict[str, str], source_key: str, db: Session):
+    """
+    Yield one build_listing_from_row result per CSV row, built BATCH_SIZE rows at a time.
+
+    If a chunk fails to build, it is rebuilt row by row so only the rows that
+    fail on their own yield their exception, for the caller to record as errors.
+    """
+    while True:
+        chunk = list(islice(reader, BATCH_SIZE))
+        if not chunk:
+            return
+        try:
+            built = build_listings_from_rows(chunk, column_map, source_key, db)
+        except Exception as e:
+            logger.warning(f"Batch build failed ({type(e).__name__}: {e}), rebuilding {len(chunk)} rows one by one")
+            built = []
+            for row in chunk:
+                try:
+                    built.append(build_listing_from_row(row, column_map, source_key, db))
+                except Exception as row_error:
+                    built.append(row_error)
+        yield from built
+
+
 @celery_app.task(bind=True)
 def process_import(self, import_id: int):
     """
@@ -282,15 +510,17 @@ def process_import(self, import_id: int):
         column_map = admin_import.column_map
 
         errors = []
-        batch = []
+        batch: Dict[str, tuple[int, Dict[str, Any]]] = {}  # canonical_url -> (row_num, new listing fields) awaiting COPY
         row_num = 0
 
-        for row in reader:
+        for built in _iter_built_listings(reader, column_map, source_key, db):
             row_num += 1
 
             try:
-                # Build listing from row using search_fields registry
-                listing_fields, extra_fields, raw_payload = build_listing_from_row(row, column_map, source_key, db)
+                # Listing built from row using search_fields registry (chunked, see helper)
+                if isinstance(built, Exception):
+                    raise built
+                listing_fields, extra_fields, raw_payload = built
 
                 if not listing_fields.get('canonical_url'):
                     errors.append(f"Row {row_num}: Missing URL")
@@ -302,12 +532,19 @@ def process_import(self, import_id: int):
                 listing_fields['raw_payload'] = raw_payload
 
                 # Upsert MergedListing (idempotent by source_key + canonical_url)
-                existing = db.query(MergedListing).filter(
+                pending = batch.get(listing_fields['canonical_url'])
+                existing = None if pending else db.query(MergedListing).filter(
                     MergedListing.source_key == source_key,
                     MergedListing.canonical_url == listing_fields['canonical_url']
                 ).first()
 
-                if existing:
+                if pending:
+                    # Repeated URL within the batch: update the not-yet-inserted row
+                    pending[1].update(listing_fields)
+
+                    admin_import.updated_count += 1
+
+                elif existing:
                     # Update existing
                     for key, value in listing_fields.items():
                         if key not in ('id', 'created_at'):
@@ -317,20 +554,11 @@ def process_import(self, import_id: int):
                     admin_import.updated_count += 1
 
                 else:
-                    # Create new listing
-                    new_listing = MergedListing(**listing_fields)
-                    db.add(new_listing)
-                    db.flush()  # Get ID
-
-                    admin_import.created_count += 1
+                    # Create new listing (inserted with the rest of the batch, counted once inserted)
+                    batch[listing_fields['canonical_url']] = (row_num, listing_fields)
 
                 admin_import.processed_rows += 1
 
-                # Batch commit
-                if admin_import.processed_rows % BATCH_SIZE == 0:
-                    db.commit()
-                    logger.info(f"Import {import_id}: Processed {admin_import.processed_rows}/{admin_import.total_rows}")
-
             except Exception as e:
                 error_msg = f"Row {row_num}: {type(e).__name__}: {e}"
                 errors.append(error_msg)
@@ -342,8 +570,16 @@ def process_import(self, import_id: int):
                     # Too many errors, abort
                     logger.error(f"Import {import_id}: Too many errors (>{100}), aborting")
                     break
+                continue
+
+            # Batch commit
+            if admin_import.processed_rows % BATCH_SIZE == 0:
+                _insert_new_listings(db, admin_import, batch, errors)
+                db.commit()
+                logger.info(f"Import {import_id}: Processed {admin_import.processed_rows}/{admin_import.total_rows}")
 
         # Final commit
+        _insert_new_listings(db, admin_import, batch, errors)
         db.commit()
 
         # Mark as complete
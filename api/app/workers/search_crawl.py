@@ -21,15 +21,14 @@ def run_on_demand_crawl(job_id: int):
         settings = get_settings()
         crawl_setting = provider_setting_service.get_setting(db, "web_crawl_on_demand")
         crawl_config = crawl_setting.settings_json if crawl_setting else {}
-        provider = WebCrawlOnDemandProvider(settings, config=crawl_config)
+        with WebCrawlOnDemandProvider(settings, config=crawl_config) as provider:
+            search_job_service.set_status(db, job, "running")
 
-        search_job_service.set_status(db, job, "running")
+            if not provider.enabled:
+                search_job_service.set_status(db, job, "failed", error="no_sources_configured", result_count=0)
+                return "no_sources"
 
-        if not provider.enabled:
-            search_job_service.set_status(db, job, "failed", error="no_sources_configured", result_count=0)
-            return "no_sources"
-
-        items = provider.crawl_sources(job.query_normalized)
+            items = provider.crawl_sources(job.query_normalized)
         saved = search_job_service.store_results(db, job.id, items)
         search_job_service.set_status(db, job, "succeeded", result_count=saved)
         return {"saved": saved}
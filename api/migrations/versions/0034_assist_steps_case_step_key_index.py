@@ -0,0 +1,28 @@
+"""Add composite (case_id, step_key) index to assist_steps
+
+Revision ID: 0034_assist_steps_step_key_idx
+Revises: 0033_site_settings
+Create Date: 2025-12-22 10:00:00
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0034_assist_steps_step_key_idx"
+down_revision = "0033_site_settings"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Step lookups filter by case and step key (e.g. "market.scout")
+    op.create_index(
+        "ix_assist_steps_case_step_key",
+        "assist_steps",
+        ["case_id", "step_key"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_assist_steps_case_step_key", "assist_steps")
@@ -6,9 +6,8 @@ from typing import Dict, Any
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from sqlalchemy.orm import joinedload
-
-from app.core.database import SessionLocal
+from app.core.database import get_db_context
+from app.models.assist_step import AssistStep
 from app.models.user import User
 from app.services import assist_service
 from app.services import user_service
@@ -38,8 +37,15 @@ def run_market_scout(db, user: User, title: str, intake_payload: Dict[str, Any])
     return case
 
 
-def main():
-    db = SessionLocal()
+def get_market_step(db, case_id: int):
+    return (
+        db.query(AssistStep)
+        .filter_by(case_id=case_id, step_key="market.scout")
+        .one_or_none()
+    )
+
+
+def validate_signatures(db) -> None:
     user = get_or_create_user(db)
 
     case1 = run_market_scout(
@@ -48,7 +54,6 @@ def main():
         "toyota supra",
         {"search": {"q": "toyota supra", "year_min": 2020}},
     )
-    case1 = db.query(assist_service.AssistCase).options(joinedload(assist_service.AssistCase.steps)).filter(assist_service.AssistCase.id == case1.id).one()
 
     # Run 2: "nissan gtr"
     case2 = run_market_scout(
@@ -57,16 +62,14 @@ def main():
         "nissan gtr",
         {"search": {"q": "nissan gtr", "year_min": 2018}},
     )
-    case2 = db.query(assist_service.AssistCase).options(joinedload(assist_service.AssistCase.steps)).filter(assist_service.AssistCase.id == case2.id).one()
 
     # Validation
-    # Find market.scout step (should be steps[1] but let's be robust)
-    market_step_1 = next((s for s in case1.steps if s.step_key == "market.scout"), None)
-    market_step_2 = next((s for s in case2.steps if s.step_key == "market.scout"), None)
+    # Fetch only the market.scout step of each case (indexed on case_id, step_key)
+    market_step_1 = get_market_step(db, case1.id)
+    market_step_2 = get_market_step(db, case2.id)
 
     if not market_step_1 or not market_step_2:
         logger.error("Validation failed: market.scout step not found")
-        db.close()
         return
 
     sig1 = market_step_1.output_json.get("signature") if market_step_1.output_json else None
@@ -85,7 +88,11 @@ def main():
     # Further checks can be done by inspecting the logs for the marketcheck provider calls
     # and comparing the results.
 
-    db.close()
+
+def main():
+    # Session is closed even if user setup or a run raises mid-way
+    with get_db_context() as db:
+        validate_signatures(db)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+"""Shared pytest fixtures for DB-backed tests."""
+
+import orjson
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool, StaticPool
+
+from app.core.config import get_settings
+from app.core.database import _json_serializer
+
+# Roots of the data DB tests commit; CASCADE reaches runs, staged listings and attributes
+_TRUNCATE_TABLES = ("admin_sources", "admin_imports")
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--db-truncate",
+        action="store_true",
+        default=False,
+        help=(
+            "Isolate `db` tests by committing for real and running TRUNCATE ... "
+            "RESTART IDENTITY CASCADE on teardown instead of rolling back a SAVEPOINT. "
+            "Wipes those tables; use a disposable database."
+        ),
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "redundant: case exercises the same code path as a stronger case; "
+        "deselect locally with -m 'not redundant'",
+    )
+
+
+def _create_test_engine(**kwargs):
+    return create_engine(
+        get_settings().database_url,
+        future=True,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+        **kwargs,
+    )
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """
+    Test engine, created once per test session.
+
+    Expects a migrated database (alembic upgrade head); the schema is owned by
+    migrations, not Base.metadata.create_all.
+    """
+    test_engine = _create_test_engine(poolclass=StaticPool)
+    yield test_engine
+    test_engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def connection(engine):
+    """
+    Single connection for the whole test session.
+
+    The outer transaction is never committed, so nothing written by tests
+    survives the run.
+    """
+    conn = engine.connect()
+    trans = conn.begin()
+    try:
+        yield conn
+    finally:
+        trans.rollback()
+        conn.close()
+
+
+@pytest.fixture
+def db(request):
+    """
+    Per-test session isolated by a SAVEPOINT.
+
+    session.commit() inside a test only releases an inner savepoint; the
+    per-test savepoint is rolled back on teardown. With --db-truncate this
+    resolves to `db_truncate` instead.
+    """
+    if request.config.getoption("--db-truncate"):
+        yield request.getfixturevalue("db_truncate")
+        return
+
+    connection = request.getfixturevalue("connection")
+    nested = connection.begin_nested()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        if nested.is_active:
+            nested.rollback()
+
+
+@pytest.fixture(scope="session")
+def truncate_engine():
+    """
+    Engine for `db_truncate`, separate from the shared SAVEPOINT connection.
+
+    NullPool so commits and TRUNCATE run on their own connection rather than
+    inside the never-committed session transaction.
+    """
+    test_engine = _create_test_engine(poolclass=NullPool)
+    yield test_engine
+    test_engine.dispose()
+
+
+@pytest.fixture
+def db_truncate(truncate_engine):
+    """
+    Per-test session whose commits are real, cleaned up with TRUNCATE ... CASCADE.
+
+    Exercises the server-side FK cascades and avoids row-by-row DELETE on
+    large tables.
+    """
+    session = Session(bind=truncate_engine)
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+        with truncate_engine.begin() as conn:
+            conn.execute(text(f"TRUNCATE {', '.join(_TRUNCATE_TABLES)} RESTART IDENTITY CASCADE"))
+
+
+@pytest.fixture(scope="session")
+def client():
+    """
+    FastAPI test client, built once per test session.
+
+    The app is imported here rather than at module level so DB-only tests
+    don't load every router.
+    """
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    return TestClient(app)
@@ -31,9 +31,14 @@ SAMPLE_HTML = """
 """
 
 
-def test_parse_list_page():
+@pytest.fixture(scope="session")
+def provider():
+    """Shared provider instance; parsing is stateless across calls."""
+    return BidfaxHtmlProvider()
+
+
+def test_parse_list_page(provider):
     """Test BidfaxHtmlProvider.parse_list_page with sample HTML."""
-    provider = BidfaxHtmlProvider()
     results = provider.parse_list_page(SAMPLE_HTML, "https://en.bidfax.info/ford/c-max/")
 
     assert len(results) == 1
@@ -51,10 +56,9 @@ def test_parse_list_page():
     assert "sold_at" in result
 
 
-def test_parse_list_page_multiple_cards():
+def test_parse_list_page_multiple_cards(provider):
     """Test parsing multiple offer cards."""
     multi_html = SAMPLE_HTML + SAMPLE_HTML.replace("123456", "654321").replace("67890", "09876")
-    provider = BidfaxHtmlProvider()
     results = provider.parse_list_page(multi_html, "https://en.bidfax.info/ford/c-max/")
 
     assert len(results) == 2
@@ -62,39 +66,35 @@ def test_parse_list_page_multiple_cards():
     assert results[1]["vin"] == "1FADP5AU1FL654321"
 
 
-def test_parse_list_page_iaai_source():
+def test_parse_list_page_iaai_source(provider):
     """Test parsing IAAI auction source."""
     iaai_html = SAMPLE_HTML.replace('<span class="copart"></span>', '<span class="iaai"></span>')
-    provider = BidfaxHtmlProvider()
     results = provider.parse_list_page(iaai_html, "https://en.bidfax.info/ford/c-max/")
 
     assert len(results) == 1
     assert results[0]["auction_source"] == "iaai"
 
 
-def test_parse_list_page_on_approval_status():
+def test_parse_list_page_on_approval_status(provider):
     """Test parsing 'on approval' sale status."""
     approval_html = SAMPLE_HTML.replace('alt="Sold"', 'alt="On approval"')
-    provider = BidfaxHtmlProvider()
     results = provider.parse_list_page(approval_html, "https://en.bidfax.info/ford/c-max/")
 
     assert len(results) == 1
     assert results[0]["sale_status"] == "on_approval"
 
 
-def test_parse_list_page_no_sale_status():
+def test_parse_list_page_no_sale_status(provider):
     """Test parsing 'no sale' status."""
     no_sale_html = SAMPLE_HTML.replace('alt="Sold"', 'alt="No sale"')
-    provider = BidfaxHtmlProvider()
     results = provider.parse_list_page(no_sale_html, "https://en.bidfax.info/ford/c-max/")
 
     assert len(results) == 1
     assert results[0]["sale_status"] == "no_sale"
 
 
-def test_parse_price():
+def test_parse_price(provider):
     """Test price parsing."""
-    provider = BidfaxHtmlProvider()
     assert provider._parse_price("$12,500") == 1250000
     assert provider._parse_price("$1,234") == 123400
     assert provider._parse_price("$50") == 5000
@@ -102,9 +102,8 @@ def test_parse_price():
     assert provider._parse_price("") is None
 
 
-def test_parse_odometer():
+def test_parse_odometer(provider):
     """Test odometer parsing."""
-    provider = BidfaxHtmlProvider()
     assert provider._parse_odometer("178424 miles") == 178424
     assert provider._parse_odometer("59,293 miles") == 59293
     assert provider._parse_odometer("100 miles") == 100
@@ -112,9 +111,8 @@ def test_parse_odometer():
     assert provider._parse_odometer("unknown") is None
 
 
-def test_parse_date():
+def test_parse_date(provider):
     """Test date parsing."""
-    provider = BidfaxHtmlProvider()
     result = provider._parse_date("16.12.2025")
     assert result.year == 2025
     assert result.month == 12
@@ -130,7 +128,7 @@ def test_parse_date():
     assert provider._parse_date("32.13.2025") is None
 
 
-def test_parse_list_page_missing_fields():
+def test_parse_list_page_missing_fields(provider):
     """Test parsing with missing optional fields."""
     minimal_html = """
     <div class="thumbnail offer">
@@ -138,7 +136,6 @@ def test_parse_list_page_missing_fields():
         <span class="prices">$12,500</span>
     </div>
     """
-    provider = BidfaxHtmlProvider()
     results = provider.parse_list_page(minimal_html, "https://en.bidfax.info/ford/c-max/")
 
     assert len(results) == 1
@@ -150,7 +147,7 @@ def test_parse_list_page_missing_fields():
     assert result["sale_status"] == "unknown"
 
 
-def test_parse_list_page_no_vin():
+def test_parse_list_page_no_vin(provider):
     """Test parsing card without VIN in title."""
     no_vin_html = """
     <div class="thumbnail offer">
@@ -159,7 +156,6 @@ def test_parse_list_page_no_vin():
         <div><span>Lot number:</span> <span class="blackfont">67890</span></div>
     </div>
     """
-    provider = BidfaxHtmlProvider()
     results = provider.parse_list_page(no_vin_html, "https://en.bidfax.info/ford/c-max/")
 
     assert len(results) == 1
@@ -168,9 +164,8 @@ def test_parse_list_page_no_vin():
     assert result["lot_id"] == "67890"
 
 
-def test_parse_list_page_empty_html():
+def test_parse_list_page_empty_html(provider):
     """Test parsing empty or invalid HTML."""
-    provider = BidfaxHtmlProvider()
     results = provider.parse_list_page("", "https://en.bidfax.info/ford/c-max/")
     assert len(results) == 0
 
@@ -481,10 +476,8 @@ def test_http_fetcher_returns_fetch_diagnostics():
     assert fetcher.rate_limit == 60
 
 
-def test_bidfax_provider_fetch_mode_selection():
+def test_bidfax_provider_fetch_mode_selection(provider):
     """Test BidfaxHtmlProvider selects correct fetcher based on fetch_mode."""
-    provider = BidfaxHtmlProvider()
-
     # Verify both fetchers are initialized
     assert isinstance(provider.http_fetcher, HttpFetcher)
     assert isinstance(provider.browser_fetcher, BrowserFetcher)
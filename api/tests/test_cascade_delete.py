@@ -9,8 +9,8 @@ Tests that deleting an admin_source properly cascades to all child records:
 This prevents IntegrityError 500 responses when deleting sources.
 """
 
-import pytest
-from datetime import datetime
+from datetime import datetime, timezone
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
 
 from app.models.admin_source import AdminSource, ProxyMode
@@ -19,6 +19,8 @@ from app.models.staged_listing import StagedListing
 from app.models.staged_listing_attribute import StagedListingAttribute
 from app.services import data_engine_service
 
+_UTC = timezone.utc
+
 
 class TestCascadeDelete:
     """Test CASCADE DELETE behavior for admin_sources."""
@@ -48,29 +50,29 @@ class TestCascadeDelete:
             proxy_mode=ProxyMode.NONE,
         )
         db.add(source)
-        db.commit()
-        db.refresh(source)
+        db.flush()  # INSERT ... RETURNING populates source.id
         source_id = source.id
 
         # Create runs
         run1 = AdminRun(
             source_id=source_id,
             status="succeeded",
-            started_at=datetime.utcnow(),
+            started_at=datetime.now(_UTC),
             pages_planned=5,
             pages_done=5,
         )
         run2 = AdminRun(
             source_id=source_id,
             status="failed",
-            started_at=datetime.utcnow(),
+            started_at=datetime.now(_UTC),
             pages_planned=3,
             pages_done=1,
         )
         db.add_all([run1, run2])
-        db.commit()
+        db.flush()
         run1_id = run1.id
         run2_id = run2.id
+        db.commit()
 
         # Verify setup
         assert db.query(AdminSource).filter_by(id=source_id).first() is not None
@@ -113,19 +115,17 @@ class TestCascadeDelete:
             proxy_mode=ProxyMode.NONE,
         )
         db.add(source)
-        db.commit()
-        db.refresh(source)
+        db.flush()
 
         # Create run
         run = AdminRun(
             source_id=source.id,
             status="running",
-            started_at=datetime.utcnow(),
+            started_at=datetime.now(_UTC),
             pages_planned=1,
         )
         db.add(run)
-        db.commit()
-        db.refresh(run)
+        db.flush()
 
         # Create staged listings
         listing1 = StagedListing(
@@ -147,12 +147,14 @@ class TestCascadeDelete:
             model="Civic",
         )
         db.add_all([listing1, listing2])
-        db.commit()
+        db.flush()
 
+        # Read ids before commit; commit expires instances and would reload them
         source_id = source.id
         run_id = run.id
         listing1_id = listing1.id
         listing2_id = listing2.id
+        db.commit()
 
         # Verify setup
         assert db.query(AdminSource).filter_by(id=source_id).first() is not None
@@ -199,19 +201,17 @@ class TestCascadeDelete:
             proxy_mode=ProxyMode.NONE,
         )
         db.add(source)
-        db.commit()
-        db.refresh(source)
+        db.flush()
 
         # Create run
         run = AdminRun(
             source_id=source.id,
             status="running",
-            started_at=datetime.utcnow(),
+            started_at=datetime.now(_UTC),
             pages_planned=1,
         )
         db.add(run)
-        db.commit()
-        db.refresh(run)
+        db.flush()
 
         # Create staged listing
         listing = StagedListing(
@@ -224,8 +224,7 @@ class TestCascadeDelete:
             model="F-150",
         )
         db.add(listing)
-        db.commit()
-        db.refresh(listing)
+        db.flush()
 
         # Create attributes
         attr1 = StagedListingAttribute(
@@ -245,14 +244,16 @@ class TestCascadeDelete:
             value_text="Used",
         )
         db.add_all([attr1, attr2, attr3])
-        db.commit()
+        db.flush()
 
+        # Read ids before commit; commit expires instances and would reload them
         source_id = source.id
         run_id = run.id
         listing_id = listing.id
         attr1_id = attr1.id
         attr2_id = attr2.id
         attr3_id = attr3.id
+        db.commit()
 
         # Verify setup
         assert db.query(AdminSource).filter_by(id=source_id).first() is not None
@@ -306,107 +307,86 @@ class TestCascadeDelete:
             proxy_mode=ProxyMode.NONE,
         )
         db.add(source)
-        db.commit()
-        db.refresh(source)
-
-        # Create runs
-        run1 = AdminRun(source_id=source.id, status="succeeded", pages_planned=1)
-        run2 = AdminRun(source_id=source.id, status="succeeded", pages_planned=1)
-        db.add_all([run1, run2])
-        db.commit()
-        db.refresh(run1)
-        db.refresh(run2)
-
-        # Create listings for run1 (3 listings)
-        run1_listings = []
-        for i in range(3):
-            listing = StagedListing(
-                run_id=run1.id,
-                source_key=source.key,
-                canonical_url=f"https://example.com/run1/{i}",
-                title=f"Run1 Listing {i}",
-            )
-            run1_listings.append(listing)
-        db.add_all(run1_listings)
-        db.commit()
-
-        # Create listings for run2 (2 listings)
-        run2_listings = []
-        for i in range(2):
-            listing = StagedListing(
-                run_id=run2.id,
-                source_key=source.key,
-                canonical_url=f"https://example.com/run2/{i}",
-                title=f"Run2 Listing {i}",
-            )
-            run2_listings.append(listing)
-        db.add_all(run2_listings)
-        db.commit()
+        db.flush()
+        source_id = source.id
+        source_key = source.key
+
+        # Bulk-insert each tier with one INSERT ... RETURNING (ids come back in row order)
+        run_ids = db.scalars(
+            insert(AdminRun).returning(AdminRun.id, sort_by_parameter_order=True),
+            [
+                {"source_id": source_id, "status": "succeeded", "pages_planned": 1},
+                {"source_id": source_id, "status": "succeeded", "pages_planned": 1},
+            ],
+        ).all()
+        run1_id, run2_id = run_ids
+
+        # Run 1 has 3 listings, run 2 has 2 listings
+        listing_rows = [
+            {
+                "run_id": run1_id,
+                "source_key": source_key,
+                "canonical_url": f"https://example.com/run1/{i}",
+                "title": f"Run1 Listing {i}",
+            }
+            for i in range(3)
+        ] + [
+            {
+                "run_id": run2_id,
+                "source_key": source_key,
+                "canonical_url": f"https://example.com/run2/{i}",
+                "title": f"Run2 Listing {i}",
+            }
+            for i in range(2)
+        ]
+        listing_ids = db.scalars(
+            insert(StagedListing).returning(StagedListing.id, sort_by_parameter_order=True),
+            listing_rows,
+        ).all()
 
         # Create attributes (2 per listing)
-        all_listings = run1_listings + run2_listings
-        attributes = []
-        for listing in all_listings:
-            db.refresh(listing)  # Ensure ID is loaded
-            attr1 = StagedListingAttribute(
-                staged_listing_id=listing.id,
-                key="key1",
-                value_text="value1",
-            )
-            attr2 = StagedListingAttribute(
-                staged_listing_id=listing.id,
-                key="key2",
-                value_text="value2",
-            )
-            attributes.extend([attr1, attr2])
-        db.add_all(attributes)
+        db.execute(
+            insert(StagedListingAttribute),
+            [
+                {"staged_listing_id": listing_id, "key": key, "value_text": value}
+                for listing_id in listing_ids
+                for key, value in (("key1", "value1"), ("key2", "value2"))
+            ],
+        )
         db.commit()
 
-        source_id = source.id
-
-        # Verify counts before delete
-        assert db.query(AdminSource).filter_by(id=source_id).count() == 1
-        assert db.query(AdminRun).filter_by(source_id=source_id).count() == 2
-        assert db.query(StagedListing).filter(
-            StagedListing.run_id.in_([run1.id, run2.id])
-        ).count() == 5
-        assert db.query(StagedListingAttribute).filter(
-            StagedListingAttribute.staged_listing_id.in_([l.id for l in all_listings])
-        ).count() == 10
+        # Verify counts before delete (one round-trip for all tiers)
+        counts = _cascade_counts(db, source_id, run_ids, listing_ids)
+        assert counts.sources == 1
+        assert counts.runs == 2
+        assert counts.listings == 5
+        assert counts.attributes == 10
 
         # Delete source
         result = data_engine_service.delete_source(db, source_id)
         assert result is True
 
         # Assert all cascaded
-        assert db.query(AdminSource).filter_by(id=source_id).count() == 0
-        assert db.query(AdminRun).filter_by(source_id=source_id).count() == 0
-        assert db.query(StagedListing).filter(
-            StagedListing.run_id.in_([run1.id, run2.id])
-        ).count() == 0
-        # Note: Can't directly query attributes by listing ID since listings are deleted
-        # but CASCADE should have deleted them
-
-
-# Fixtures
-@pytest.fixture
-def db():
-    """
-    Database session fixture.
-
-    In a real test environment, this would:
-    1. Create a test database
-    2. Run migrations
-    3. Provide a session
-    4. Rollback/cleanup after test
-
-    For now, this is a placeholder that would be configured with pytest-postgresql
-    or a similar testing setup.
-    """
-    from app.core.database import SessionLocal
-    session = SessionLocal()
-    try:
-        yield session
-    finally:
-        session.rollback()
-        session.close()
+        counts = _cascade_counts(db, source_id, run_ids, listing_ids)
+        assert counts.sources == 0
+        assert counts.runs == 0
+        assert counts.listings == 0
+        assert counts.attributes == 0
+
+
+def _cascade_counts(db: Session, source_id: int, run_ids, listing_ids):
+    """Row counts per cascade tier, fetched as scalar subqueries in a single SELECT."""
+    def count(model, *criteria):
+        return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+    return db.execute(
+        select(
+            count(AdminSource, AdminSource.id == source_id).label("sources"),
+            count(AdminRun, AdminRun.source_id == source_id).label("runs"),
+            count(StagedListing, StagedListing.run_id.in_(run_ids)).label("listings"),
+            count(
+                StagedListingAttribute,
+                StagedListingAttribute.staged_listing_id.in_(listing_ids),
+            ).label("attributes"),
+        )
+    ).one()
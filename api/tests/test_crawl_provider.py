@@ -15,7 +15,7 @@ class WebCrawlProviderTests(unittest.TestCase):
             )
         )
 
-    @patch("app.providers.web_crawl.httpx.get")
+    @patch("app.providers.web_crawl.httpx.Client.get")
     def test_non_html_response_is_ignored(self, mock_get):
         mock_get.return_value = SimpleNamespace(
             status_code=200,
@@ -27,7 +27,7 @@ class WebCrawlProviderTests(unittest.TestCase):
         results = provider.crawl_sources("gtr")
         self.assertEqual(results, [])
 
-    @patch("app.providers.web_crawl.httpx.get")
+    @patch("app.providers.web_crawl.httpx.Client.get")
     def test_results_do_not_include_forbidden_fields(self, mock_get):
         html = '<html><body><a href="https://example.com/listing/1">2010 Nissan GT-R</a></body></html>'
         mock_get.return_value = SimpleNamespace(
@@ -46,6 +46,33 @@ class WebCrawlProviderTests(unittest.TestCase):
         self.assertIsNone(row.get("price"))
         self.assertIsNone(row.get("location"))
 
+    @patch("app.providers.web_crawl.httpx.Client.get")
+    def test_client_is_reused_across_sources_and_closed(self, mock_get):
+        mock_get.return_value = SimpleNamespace(
+            status_code=200,
+            headers={"content-type": "application/json"},
+            text="{}",
+            url=SimpleNamespace(host="example.com"),
+        )
+        provider = WebCrawlOnDemandProvider(
+            Settings(
+                CRAWL_SEARCH_ALLOWLIST=[
+                    "https://example.com/search?q={query}",
+                    "https://example.org/search?q={query}",
+                ],
+                CRAWL_SEARCH_RATE_PER_MINUTE=5,
+            )
+        )
+        with provider:
+            provider.crawl_sources("gtr")
+            client = provider._client
+            self.assertIsNotNone(client)
+            provider.crawl_sources("gtr")
+            self.assertIs(provider._client, client)
+        self.assertEqual(mock_get.call_count, 4)
+        self.assertIsNone(provider._client)
+        self.assertTrue(client.is_closed)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,11 +1,34 @@
 """Tests for internal-first search logic."""
 
-import pytest
-from unittest.mock import Mock, MagicMock, patch
-from datetime import datetime
-
 from app.core.config import Settings
 
+# Built once; tests override only the internal-first flags via model_copy
+_BASE_SETTINGS = Settings()
+
+
+class _Provider:
+    """Provider stub whose search_listings records its kwargs and returns (items, total, meta)."""
+
+    __slots__ = ("name", "search_listings", "calls")
+
+    def __init__(self, name, items, total):
+        self.name = name
+        self.calls = []
+        result = (items, total, {"name": name, "enabled": True})
+
+        def search_listings(**kwargs):
+            self.calls.append(kwargs)
+            return result
+
+        self.search_listings = search_listings
+
+
+def _should_query_external(settings, total):
+    """Internal-first branch: whether external providers get queried after internal returned `total`."""
+    return not settings.search_internal_first or (
+        total < settings.search_internal_min_results and settings.search_external_fallback_enabled
+    )
+
 
 class TestInternalFirstSearch:
     """Test internal-first search behavior."""
@@ -16,49 +39,28 @@ class TestInternalFirstSearch:
         external providers should NOT be queried.
         """
         # Setup
-        settings = Settings(
-            search_internal_first=True,
-            search_internal_min_results=1,
-            search_external_fallback_enabled=False,
-        )
-
-        internal_provider = Mock()
-        internal_provider.name = "internal_catalog"
-        internal_provider.search_listings = Mock(return_value=(
-            [{"id": "1", "title": "Test Car"}],  # items
-            1,  # total
-            {"name": "internal_catalog", "enabled": True}  # meta
-        ))
-
-        external_provider = Mock()
-        external_provider.name = "marketcheck"
-        external_provider.search_listings = Mock()
-
-        # Logic simulation
-        total = 0
-        providers = [internal_provider, external_provider]
+        settings = _BASE_SETTINGS.model_copy(update={
+            "search_internal_first": True,
+            "search_internal_min_results": 1,
+            "search_external_fallback_enabled": False,
+        })
+        internal_provider = _Provider("internal_catalog", [{"id": "1", "title": "Test Car"}], 1)
+        external_provider = _Provider("marketcheck", [], 0)
 
         # Query internal first
-        items, provider_total, meta = internal_provider.search_listings(
+        items, total, meta = internal_provider.search_listings(
             query="test",
             filters={},
             page=1,
             page_size=25,
         )
-        total += provider_total
-
-        # Check if should query external
-        should_query_external = (
-            not settings.search_internal_first or
-            (total < settings.search_internal_min_results and settings.search_external_fallback_enabled)
-        )
 
         # Assertions
-        assert internal_provider.search_listings.called
+        assert len(internal_provider.calls) == 1
         assert total == 1
-        assert not should_query_external
+        assert _should_query_external(settings, total) is False
         # External provider should NOT be called
-        assert not external_provider.search_listings.called
+        assert not external_provider.calls
 
     def test_internal_first_with_fallback(self):
         """
@@ -66,62 +68,37 @@ class TestInternalFirstSearch:
         external providers SHOULD be queried.
         """
         # Setup
-        settings = Settings(
-            search_internal_first=True,
-            search_internal_min_results=1,
-            search_external_fallback_enabled=True,
-        )
-
-        internal_provider = Mock()
-        internal_provider.name = "internal_catalog"
-        internal_provider.search_listings = Mock(return_value=(
-            [],  # No results
-            0,
-            {"name": "internal_catalog", "enabled": True}
-        ))
-
-        external_provider = Mock()
-        external_provider.name = "marketcheck"
-        external_provider.search_listings = Mock(return_value=(
-            [{"id": "ext1", "title": "External Car"}],
-            1,
-            {"name": "marketcheck", "enabled": True}
-        ))
-
-        # Logic simulation
-        total = 0
+        settings = _BASE_SETTINGS.model_copy(update={
+            "search_internal_first": True,
+            "search_internal_min_results": 1,
+            "search_external_fallback_enabled": True,
+        })
+        internal_provider = _Provider("internal_catalog", [], 0)
+        external_provider = _Provider("marketcheck", [{"id": "ext1", "title": "External Car"}], 1)
 
         # Query internal first
-        items, provider_total, meta = internal_provider.search_listings(
+        items, total, meta = internal_provider.search_listings(
             query="test",
             filters={},
             page=1,
             page_size=25,
         )
-        total += provider_total
-
-        # Check if should query external
-        should_query_external = (
-            not settings.search_internal_first or
-            (total < settings.search_internal_min_results and settings.search_external_fallback_enabled)
-        )
 
         # Assertions
-        assert internal_provider.search_listings.called
+        assert len(internal_provider.calls) == 1
         assert total == 0
-        assert should_query_external
+        assert _should_query_external(settings, total) is True
 
-        # If condition is true, external provider WOULD be called
-        if should_query_external:
-            ext_items, ext_total, ext_meta = external_provider.search_listings(
-                query="test",
-                filters={},
-                page=1,
-                page_size=25,
-            )
-            total += ext_total
+        # Condition is true, so the external provider is queried next
+        ext_items, ext_total, ext_meta = external_provider.search_listings(
+            query="test",
+            filters={},
+            page=1,
+            page_size=25,
+        )
+        total += ext_total
 
-        assert external_provider.search_listings.called
+        assert len(external_provider.calls) == 1
         assert total == 1
 
     def test_internal_first_disabled(self):
@@ -130,51 +107,26 @@ class TestInternalFirstSearch:
         all providers should be queried (old behavior).
         """
         # Setup
-        settings = Settings(
-            search_internal_first=False,
-            search_internal_min_results=1,
-            search_external_fallback_enabled=False,
-        )
-
-        internal_provider = Mock()
-        internal_provider.name = "internal_catalog"
-        internal_provider.search_listings = Mock(return_value=(
-            [{"id": "1"}],
-            1,
-            {"name": "internal_catalog", "enabled": True}
-        ))
-
-        external_provider = Mock()
-        external_provider.name = "marketcheck"
-        external_provider.search_listings = Mock(return_value=(
-            [{"id": "ext1"}],
-            1,
-            {"name": "marketcheck", "enabled": True}
-        ))
-
-        # Logic simulation
+        settings = _BASE_SETTINGS.model_copy(update={
+            "search_internal_first": False,
+            "search_internal_min_results": 1,
+            "search_external_fallback_enabled": False,
+        })
+        internal_provider = _Provider("internal_catalog", [{"id": "1"}], 1)
+
+        # Internal-first is off, so internal is not queried up front
         total = 0
-
-        # Query internal first
-        if settings.search_internal_first and internal_provider:
-            items, provider_total, meta = internal_provider.search_listings(
+        if settings.search_internal_first:
+            items, total, meta = internal_provider.search_listings(
                 query="test",
                 filters={},
                 page=1,
                 page_size=25,
             )
-            total += provider_total
-
-        # Check if should query external
-        should_query_external = (
-            not settings.search_internal_first or
-            (total < settings.search_internal_min_results and settings.search_external_fallback_enabled)
-        )
 
         # Assertions
-        assert should_query_external  # Since internal_first is False
-        # Both providers WOULD be called in real implementation
-        # (In this test, we verify the logic condition)
+        assert not internal_provider.calls
+        assert _should_query_external(settings, total) is True  # Since internal_first is False
 
     def test_fallback_disabled_prevents_external_queries(self):
         """
@@ -182,22 +134,14 @@ class TestInternalFirstSearch:
         external providers should NOT be queried.
         """
         # Setup
-        settings = Settings(
-            search_internal_first=True,
-            search_internal_min_results=1,
-            search_external_fallback_enabled=False,  # Disabled
-        )
-
-        total = 0  # Internal returned 0 results
-
-        # Check if should query external
-        should_query_external = (
-            not settings.search_internal_first or
-            (total < settings.search_internal_min_results and settings.search_external_fallback_enabled)
-        )
-
-        # Assertions
-        assert not should_query_external  # Fallback is disabled
+        settings = _BASE_SETTINGS.model_copy(update={
+            "search_internal_first": True,
+            "search_internal_min_results": 1,
+            "search_external_fallback_enabled": False,  # Disabled
+        })
+
+        # Internal returned 0 results; fallback is disabled
+        assert _should_query_external(settings, 0) is False
 
 
 class TestConfigurationDefaults:
@@ -14,6 +14,13 @@ from pydantic import ValidationError
 from app.models.admin_source import ProxyMode
 from app.schemas.data_engine import AdminSourceCreate, AdminSourceUpdate
 
+# Fields every AdminSourceCreate case shares; only proxy_mode varies
+_SOURCE_DATA = {
+    "key": "test_source",
+    "name": "Test Source",
+    "base_url": "https://example.com",
+}
+
 
 def test_proxy_mode_enum_values_are_uppercase():
     """Verify that ProxyMode enum values are uppercase."""
@@ -29,40 +36,18 @@ def test_proxy_mode_enum_by_name():
     assert ProxyMode["MANUAL"] == ProxyMode.MANUAL
 
 
-def test_admin_source_create_normalizes_lowercase_proxy_mode():
-    """Verify that AdminSourceCreate normalizes lowercase proxy_mode to uppercase."""
-    data = {
-        "key": "test_source",
-        "name": "Test Source",
-        "base_url": "https://example.com",
-        "proxy_mode": "none",  # lowercase
-    }
-    source = AdminSourceCreate(**data)
-    assert source.proxy_mode == ProxyMode.NONE
-
-
-def test_admin_source_create_accepts_uppercase_proxy_mode():
-    """Verify that AdminSourceCreate accepts uppercase proxy_mode."""
-    data = {
-        "key": "test_source",
-        "name": "Test Source",
-        "base_url": "https://example.com",
-        "proxy_mode": "NONE",  # uppercase
-    }
-    source = AdminSourceCreate(**data)
-    assert source.proxy_mode == ProxyMode.NONE
-
-
-def test_admin_source_create_accepts_enum_value():
-    """Verify that AdminSourceCreate accepts ProxyMode enum directly."""
-    data = {
-        "key": "test_source",
-        "name": "Test Source",
-        "base_url": "https://example.com",
-        "proxy_mode": ProxyMode.POOL,
-    }
-    source = AdminSourceCreate(**data)
-    assert source.proxy_mode == ProxyMode.POOL
+@pytest.mark.parametrize(
+    "proxy_mode_in,expected",
+    [
+        pytest.param("none", ProxyMode.NONE, id="lowercase"),
+        pytest.param("NONE", ProxyMode.NONE, id="uppercase"),
+        pytest.param(ProxyMode.POOL, ProxyMode.POOL, id="enum_value"),
+    ],
+)
+def test_admin_source_create_proxy_mode(proxy_mode_in, expected):
+    """Verify that AdminSourceCreate accepts lowercase, uppercase and enum proxy_mode."""
+    source = AdminSourceCreate(**_SOURCE_DATA, proxy_mode=proxy_mode_in)
+    assert source.proxy_mode == expected
 
 
 def test_admin_source_update_normalizes_lowercase_proxy_mode():
@@ -94,26 +79,22 @@ def test_proxy_mode_rejects_invalid_values():
     assert "proxy_mode" in str(exc_info.value).lower()
 
 
-def test_proxy_mode_mixed_case_normalization():
-    """Verify that mixed case proxy_mode values are normalized correctly."""
-    test_cases = [
-        ("none", ProxyMode.NONE),
+@pytest.mark.parametrize(
+    "input_value,expected_enum",
+    [
+        # Same inputs as test_admin_source_create_proxy_mode
+        pytest.param("none", ProxyMode.NONE, marks=pytest.mark.redundant),
         ("None", ProxyMode.NONE),
-        ("NONE", ProxyMode.NONE),
+        pytest.param("NONE", ProxyMode.NONE, marks=pytest.mark.redundant),
         ("pool", ProxyMode.POOL),
         ("Pool", ProxyMode.POOL),
         ("POOL", ProxyMode.POOL),
         ("manual", ProxyMode.MANUAL),
         ("Manual", ProxyMode.MANUAL),
         ("MANUAL", ProxyMode.MANUAL),
-    ]
-
-    for input_value, expected_enum in test_cases:
-        data = {
-            "key": "test_source",
-            "name": "Test Source",
-            "base_url": "https://example.com",
-            "proxy_mode": input_value,
-        }
-        source = AdminSourceCreate(**data)
-        assert source.proxy_mode == expected_enum, f"Failed for input: {input_value}"
+    ],
+)
+def test_proxy_mode_case_normalization(input_value, expected_enum):
+    """Verify that mixed case proxy_mode values are normalized correctly."""
+    source = AdminSourceCreate(**_SOURCE_DATA, proxy_mode=input_value)
+    assert source.proxy_mode == expected_enum
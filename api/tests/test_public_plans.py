@@ -8,27 +8,21 @@ These tests verify:
 
 from datetime import datetime, timedelta
 
-import pytest
 from sqlalchemy.orm import Session
 
 from app.models.plan import Plan
 from app.routers.public_plans import list_public_plans
 
+# Reference time for plan created_at ordering, taken once at import
+_NOW = datetime.utcnow()
+
 
 class TestPublicPlansEndpoint:
     def test_filters_inactive_and_orders(self, db: Session):
-        now = datetime.utcnow()
-
-        keys = [
-            "test_public_plans_a",
-            "test_public_plans_b",
-            "test_public_plans_c",
-            "test_public_plans_inactive",
-        ]
-        db.query(Plan).filter(Plan.key.in_(keys)).delete(synchronize_session=False)
-        # Ensure any existing featured plan does not conflict with the test plan below.
+        # Ensure any existing featured plan does not conflict with the test plan below
+        # (uq_plans_featured_true allows one featured plan).
         db.query(Plan).filter(Plan.is_featured.is_(True)).update({"is_featured": False})
-        db.commit()
+        # No cleanup: the `db` fixture rolls back this update and the rows below on teardown.
 
         plan_c = Plan(
             key="test_public_plans_c",
@@ -40,7 +34,7 @@ class TestPublicPlansEndpoint:
             is_active=True,
             is_featured=False,
             sort_order=1,
-            created_at=now - timedelta(days=2),
+            created_at=_NOW - timedelta(days=2),
         )
         plan_b = Plan(
             key="test_public_plans_b",
@@ -52,7 +46,7 @@ class TestPublicPlansEndpoint:
             is_active=True,
             is_featured=False,
             sort_order=1,
-            created_at=now - timedelta(days=1),
+            created_at=_NOW - timedelta(days=1),
         )
         plan_a = Plan(
             key="test_public_plans_a",
@@ -64,7 +58,7 @@ class TestPublicPlansEndpoint:
             is_active=True,
             is_featured=True,
             sort_order=2,
-            created_at=now,
+            created_at=_NOW,
         )
         plan_inactive = Plan(
             key="test_public_plans_inactive",
@@ -76,10 +70,12 @@ class TestPublicPlansEndpoint:
             is_active=False,
             is_featured=False,
             sort_order=0,
-            created_at=now - timedelta(days=3),
+            created_at=_NOW - timedelta(days=3),
         )
 
-        db.add_all([plan_a, plan_b, plan_c, plan_inactive])
+        # One batched INSERT; the assertions below re-query, so the objects
+        # don't need to be tracked in the identity map.
+        db.bulk_save_objects([plan_a, plan_b, plan_c, plan_inactive])
         db.commit()
 
         res = list_public_plans(db)
@@ -87,19 +83,3 @@ class TestPublicPlansEndpoint:
 
         assert [p.slug for p in plans] == ["test-public-plans-c", "test-public-plans-b", "test-public-plans-a"]
         assert all(p.is_active for p in plans)
-
-        # Cleanup (best-effort; tests are often run against a dedicated DB anyway).
-        db.query(Plan).filter(Plan.key.in_(keys)).delete(synchronize_session=False)
-        db.commit()
-
-
-@pytest.fixture
-def db():
-    from app.core.database import SessionLocal
-
-    session = SessionLocal()
-    try:
-        yield session
-    finally:
-        session.rollback()
-        session.close()
@@ -3,7 +3,8 @@ import pytest
 from app.services import source_detect_service
 
 
-def test_detect_v2_jsonld_product():
+@pytest.fixture(scope="module")
+def jsonld_product_res():
     html = """
     <html>
       <head>
@@ -23,19 +24,26 @@ def test_detect_v2_jsonld_product():
     </html>
     """
 
-    res = source_detect_service.detect_from_html(html, used_url="https://example.com/p/test-product")
+    return source_detect_service.detect_from_html(html, used_url="https://example.com/p/test-product")
+
+
+def test_detect_v2_jsonld_product(jsonld_product_res):
+    res = jsonld_product_res
     assert res["signals"]["jsonld_count"] >= 1
     assert res["signals"]["has_Product"] is True
     assert res["detected_strategy"] == "jsonld_product"
 
-    extract = res["suggested_extract"]
+
+def test_detect_v2_jsonld_product_suggests_paths(jsonld_product_res):
+    extract = jsonld_product_res["suggested_extract"]
     assert extract["strategy"] == "jsonld"
     assert extract["jsonld"]["mode"] == "Product"
     assert extract["fields"]["title"]["path"] == "name"
     assert extract["fields"]["url"]["path"] == "url"
 
 
-def test_detect_v2_woocommerce_category_suggests_selectors():
+@pytest.fixture(scope="module")
+def woocommerce_category_res():
     html = """
     <html>
       <head>
@@ -77,7 +85,11 @@ def test_detect_v2_woocommerce_category_suggests_selectors():
     </html>
     """
 
-    res = source_detect_service.detect_from_html(html, used_url="https://example.com/shop")
+    return source_detect_service.detect_from_html(html, used_url="https://example.com/shop")
+
+
+def test_detect_v2_woocommerce_category_suggests_selectors(woocommerce_category_res):
+    res = woocommerce_category_res
     assert res["detected_strategy"] == "woocommerce"
 
     patch = res["suggested_settings_patch"]
@@ -91,13 +103,16 @@ def test_detect_v2_woocommerce_category_suggests_selectors():
         or "/product/" in extract["fields"]["url"]["selector"]
     )
 
+
+def test_detect_v2_woocommerce_category_confidence(woocommerce_category_res):
     # Confidence should remain high for strong WooCommerce signals.
-    woo = next((c for c in res["candidates"] if c.get("strategy_key") == "woocommerce"), None)
+    woo = next((c for c in woocommerce_category_res["candidates"] if c.get("strategy_key") == "woocommerce"), None)
     assert woo is not None
     assert float(woo.get("confidence") or 0) >= 0.7
 
 
-def test_detect_v2_shopify_collection_suggests_selectors_and_products_json():
+@pytest.fixture(scope="module")
+def shopify_collection_res():
     used_url = "https://example.myshopify.com/collections/wheels"
     html = """
     <html>
@@ -138,7 +153,11 @@ def test_detect_v2_shopify_collection_suggests_selectors_and_products_json():
     </html>
     """
 
-    res = source_detect_service.detect_from_html(html, used_url=used_url)
+    return source_detect_service.detect_from_html(html, used_url=used_url)
+
+
+def test_detect_v2_shopify_collection_suggests_selectors(shopify_collection_res):
+    res = shopify_collection_res
     assert res["detected_strategy"] == "shopify"
 
     extract = res["suggested_extract"]
@@ -147,11 +166,15 @@ def test_detect_v2_shopify_collection_suggests_selectors_and_products_json():
     assert extract["fields"]["url"]["selector"]
     assert extract["fields"]["title"]["selector"]
 
+
+def test_detect_v2_shopify_collection_products_json(shopify_collection_res):
+    extract = shopify_collection_res["suggested_extract"]
     assert "shopify" in extract
     assert extract["shopify"]["products_json_url"].endswith("/products.json")
 
 
-def test_detect_v2_generic_html_list_cards_suggests_selectors():
+@pytest.fixture(scope="module")
+def generic_html_list_res():
     html = """
     <html>
       <head><title>Listings</title></head>
@@ -188,7 +211,11 @@ def test_detect_v2_generic_html_list_cards_suggests_selectors():
     </html>
     """
 
-    res = source_detect_service.detect_from_html(html, used_url="https://example.com/listings")
+    return source_detect_service.detect_from_html(html, used_url="https://example.com/listings")
+
+
+def test_detect_v2_generic_html_list_cards_suggests_selectors(generic_html_list_res):
+    res = generic_html_list_res
     assert res["detected_strategy"] == "generic_html_list"
 
     extract = res["suggested_extract"]
@@ -2,18 +2,35 @@
 Visual Browser Scraper - Uses Your Production Parsing Logic
 
 Scrapes 5 BidFax URLs with:
-- Visual browser (watch it work!)
+- Plain HTTP/2 fetch using your Cloudflare cookie
+- Visual browser fallback for challenged pages (watch it work!)
 - 2Captcha auto-solve
 - Your cookies
 - Production HTML parsing
 """
 
-import json
+import asyncio
+import logging
 import re
+import sys
 import time
 from datetime import datetime
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+from urllib.parse import urlparse
+import httpx
+import orjson
+from playwright.async_api import async_playwright
+from selectolax.lexbor import LexborHTMLParser
+
+logger = logging.getLogger(__name__)
+
+_VIN_RE = re.compile(r'\b[A-HJ-NPR-Z0-9]{17}\b')
+_PRICE_RE = re.compile(r'\$?([\d,]+)')
+_MILES_RE = re.compile(r'(\d+)\s*miles', re.IGNORECASE)
+# VIN alphabet excludes I, O, Q to avoid confusion with 1, 0
+_VIN_EXCLUDED_CHARS = frozenset('IOQ')
+
+# Card selector; every field inside a card comes from one walk (card_to_soa)
+_SEL_CARDS = 'div.thumbnail.offer'
 
 # Your cookies
 COOKIES = (
@@ -24,6 +41,15 @@ COOKIES = (
     "PHPSESSID=c46059d7c7060f9b481564c0449664a3"
 )
 
+# cf_clearance is bound to the user agent that earned it; HTTP and browser must match
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Cloudflare answers a challenge with these instead of the listing page
+CHALLENGE_STATUSES = (403, 503)
+
+# Tabs kept open for browser fallback fetches; URLs take turns on them
+BROWSER_TABS = 3
+
 URLS = [
     {"url": "https://en.bidfax.info/toyota/4runner/", "make": "Toyota", "model": "4Runner"},
     {"url": "https://en.bidfax.info/ford/mustang/", "make": "Ford", "model": "Mustang"},
@@ -32,66 +58,156 @@ URLS = [
     {"url": "https://en.bidfax.info/nissan/altima/", "make": "Nissan", "model": "Altima"},
 ]
 
+# Every URL is on the same host, so the cookies are scoped to it once
+COOKIE_DOMAIN = urlparse(URLS[0]['url']).hostname
+
+
+async def block_heavy_resources(route):
+    """Abort subresources the parser never reads; documents, scripts and XHR still load."""
+    if route.request.resource_type in ("image", "font", "media", "stylesheet"):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+# Parsed cookie lists keyed by (domain, cookie_string); the HTTP and browser paths share one
+_COOKIE_CACHE = {}
+
 
-def parse_cookies(url, cookie_string):
-    """Parse cookie string into Playwright format."""
-    from urllib.parse import urlparse
-    parsed_url = urlparse(url)
-    domain = parsed_url.hostname
-
-    cookies = []
-    for cookie in cookie_string.split(';'):
-        cookie = cookie.strip()
-        if '=' not in cookie:
-            continue
-        name, value = cookie.split('=', 1)
-        cookies.append({
-            'name': name.strip(),
-            'value': value.strip(),
-            'domain': domain,
-            'path': '/',
-        })
+def parse_cookies(domain, cookie_string):
+    """Parse cookie string into Playwright format (cached per domain and cookie string)."""
+    key = (domain, cookie_string)
+    cookies = _COOKIE_CACHE.get(key)
+    if cookies is None:
+        cookies = _COOKIE_CACHE[key] = [
+            {'name': name.strip(), 'value': value.strip(), 'domain': domain, 'path': '/'}
+            for name, sep, value in (c.partition('=') for c in cookie_string.split(';'))
+            if sep
+        ]
     return cookies
 
 
+def extract_vin(title_text):
+    """First 17-char VIN in a card title; plain tokens are checked before the regex."""
+    for token in title_text.split():
+        if (
+            len(token) == 17
+            and token.isascii()
+            and token.isalnum()
+            and token == token.upper()
+            and not _VIN_EXCLUDED_CHARS.intersection(token)
+        ):
+            return token
+    vin_match = _VIN_RE.search(title_text)
+    return vin_match.group(0) if vin_match else None
+
+
+def parse_price(price_text):
+    """Whole dollars from text like '$12,500'; regex only for unusual formats."""
+    parts = price_text.lstrip('$').replace(',', '').split(None, 1)
+    head = parts[0] if parts else ''
+    if head.isdecimal():
+        return int(head)
+    price_match = _PRICE_RE.search(price_text)
+    return int(price_match.group(1).replace(',', '')) if price_match else None
+
+
+def parse_odometer(text):
+    """Miles from text like '178424 miles', or None; regex only for unusual formats."""
+    idx = text.lower().find('miles')
+    if idx < 0:
+        return None
+    before = text[:idx].rstrip()
+    number = before.rsplit(None, 1)[-1] if before else ''
+    if number.isdecimal():
+        return int(number)
+    odometer_match = _MILES_RE.search(text)
+    return int(odometer_match.group(1)) if odometer_match else None
+
+
+def card_to_soa(card):
+    """
+    Pre-extract every field source of a card in one pre-order walk.
+
+    Returns the VIN from the first h2, the price text, the first img alt,
+    auction-source flags, the first odometer reading, and labels mapping
+    lowercased label text ('lot number:', 'damage:', ...) to span.blackfont
+    values. Each span.blackfont is keyed by the nearest non-blank text before
+    it; first occurrence wins. Returns None for cards without a VIN (ads,
+    placeholders), stopping at their h2 when they have one.
+    """
+    soa = {
+        'vin': None,
+        'price': None,
+        'img_alt': None,
+        'copart': False,
+        'iaai': False,
+        'odometer': None,
+        'labels': {},
+    }
+    labels = soa['labels']
+    last_text = ''
+    seen_h2 = False
+    for node in card.traverse(include_text=True):
+        tag = node.tag
+        if tag == '-text':
+            text = node.text(deep=False).strip()
+            if text:
+                last_text = text
+                if soa['odometer'] is None:
+                    soa['odometer'] = parse_odometer(text)
+        elif tag == 'span':
+            classes = (node.attributes.get('class') or '').split()
+            if 'blackfont' in classes:
+                labels.setdefault(last_text.lower(), node.text(deep=True).strip())
+            if 'prices' in classes and soa['price'] is None:
+                soa['price'] = node.text(deep=True).strip()
+            if 'copart' in classes:
+                soa['copart'] = True
+            if 'iaai' in classes:
+                soa['iaai'] = True
+        elif tag == 'h2':
+            if not seen_h2:
+                seen_h2 = True
+                soa['vin'] = extract_vin(node.text(deep=True))
+                if not soa['vin']:
+                    return None
+        elif tag == 'img':
+            if soa['img_alt'] is None and 'alt' in node.attributes:
+                soa['img_alt'] = (node.attributes['alt'] or '').lower()
+    return soa if soa['vin'] else None
+
+
 def parse_bidfax_card(card, url):
     """Parse a single BidFax listing card (your production logic)."""
-    result = {'source_url': url, 'scraped_at': datetime.now().isoformat()}
-
     try:
-        # VIN from h2 title
-        h2 = card.find('h2')
-        if h2:
-            title_text = h2.get_text()
-            vin_match = re.search(r'\b[A-HJ-NPR-Z0-9]{17}\b', title_text)
-            if vin_match:
-                result['vin'] = vin_match.group(0)
+        # VIN from h2 title; skip cards without one (ads, placeholders)
+        soa = card_to_soa(card)
+        if soa is None:
+            return None
+        labels = soa['labels']
+
+        result = {'source_url': url, 'scraped_at': datetime.now().isoformat(), 'vin': soa['vin']}
 
         # Price
-        price_span = card.find('span', class_='prices')
-        if price_span:
-            price_text = price_span.get_text().strip()
-            price_match = re.search(r'\$?([\d,]+)', price_text)
-            if price_match:
-                result['sold_price'] = int(price_match.group(1).replace(',', ''))
+        if soa['price'] is not None:
+            sold_price = parse_price(soa['price'])
+            if sold_price is not None:
+                result['sold_price'] = sold_price
 
         # Lot ID
-        lot_label = card.find(string=re.compile(r'Lot number:', re.IGNORECASE))
-        if lot_label:
-            lot_span = lot_label.find_next('span', class_='blackfont')
-            if lot_span:
-                result['lot_id'] = lot_span.get_text().strip()
+        if 'lot number:' in labels:
+            result['lot_id'] = labels['lot number:']
 
         # Auction source
-        if card.find('span', class_='copart'):
+        if soa['copart']:
             result['auction_source'] = 'copart'
-        elif card.find('span', class_='iaai'):
+        elif soa['iaai']:
             result['auction_source'] = 'iaai'
 
         # Sale status
-        status_img = card.find('img', alt=True)
-        if status_img:
-            alt = status_img['alt'].lower()
+        alt = soa['img_alt']
+        if alt is not None:
             if 'sold' in alt:
                 result['sale_status'] = 'sold'
             elif 'approval' in alt:
@@ -100,54 +216,41 @@ def parse_bidfax_card(card, url):
                 result['sale_status'] = 'not_sold'
 
         # Date
-        date_label = card.find(string=re.compile(r'Date of sale:', re.IGNORECASE))
-        if date_label:
-            date_span = date_label.find_next('span', class_='blackfont')
-            if date_span:
-                result['sale_date'] = date_span.get_text().strip()
+        if 'date of sale:' in labels:
+            result['sale_date'] = labels['date of sale:']
 
         # Odometer
-        odometer_text = card.find(string=re.compile(r'(\d+)\s*miles', re.IGNORECASE))
-        if odometer_text:
-            odometer_match = re.search(r'(\d+)\s*miles', odometer_text, re.IGNORECASE)
-            if odometer_match:
-                result['odometer'] = int(odometer_match.group(1).replace(',', ''))
+        if soa['odometer'] is not None:
+            result['odometer'] = soa['odometer']
 
         # Damage
-        damage_label = card.find(string=re.compile(r'Damage:', re.IGNORECASE))
-        if damage_label:
-            damage_span = damage_label.find_next('span', class_='blackfont')
-            if damage_span:
-                result['damage'] = damage_span.get_text().strip()
+        if 'damage:' in labels:
+            result['damage'] = labels['damage:']
 
         # Condition
-        condition_label = card.find(string=re.compile(r'Condition:', re.IGNORECASE))
-        if condition_label:
-            condition_span = condition_label.find_next('span', class_='blackfont')
-            if condition_span:
-                result['condition'] = condition_span.get_text().strip()
+        if 'condition:' in labels:
+            result['condition'] = labels['condition:']
 
         # Location
-        location_label = card.find(string=re.compile(r'Location:', re.IGNORECASE))
-        if location_label:
-            location_span = location_label.find_next('span', class_='blackfont')
-            if location_span:
-                result['location'] = location_span.get_text().strip()
+        if 'location:' in labels:
+            result['location'] = labels['location:']
 
-        return result if len(result) > 2 else None
+        return result
 
     except Exception as e:
-        print(f"      Error parsing card: {e}")
+        logger.warning(f"      Error parsing card: {e}")
         return None
 
 
 def parse_bidfax_listings(html, url):
     """Parse all listings from BidFax page."""
-    soup = BeautifulSoup(html, 'html.parser')
-    cards = soup.select('div.thumbnail.offer')
+    if not html or not html.strip():
+        return []
+
+    tree = LexborHTMLParser(html)
     listings = []
 
-    for card in cards:
+    for card in tree.css(_SEL_CARDS):
         parsed = parse_bidfax_card(card, url)
         if parsed:
             listings.append(parsed)
@@ -155,100 +258,179 @@ def parse_bidfax_listings(html, url):
     return listings
 
 
-print("=" * 80)
-print("VISUAL BROWSER SCRAPER - 5 URLs")
-print("=" * 80)
-print()
-print("Features:")
-print("  - VISUAL browser (watch it work!)")
-print("  - Cookie injection (Cloudflare bypass)")
-print("  - Production parsing logic")
-print("  - 2Captcha ready (if challenge appears)")
-print()
-
-all_results = []
-
-with sync_playwright() as p:
-    print("Launching browser...")
-    browser = p.chromium.launch(
-        headless=False,  # VISUAL!
-        args=[
-            '--disable-blink-features=AutomationControlled',
-            '--no-sandbox',
-        ],
-        slow_mo=500  # Slow down by 500ms to watch
-    )
-
-    context = browser.new_context(
-        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-        viewport={'width': 1920, 'height': 1080},
-    )
-
-    # Inject cookies
-    cookie_list = parse_cookies(URLS[0]['url'], COOKIES)
-    context.add_cookies(cookie_list)
-    print(f"Injected {len(cookie_list)} cookies\n")
-
-    # Scrape each URL
-    for idx, target in enumerate(URLS, 1):
-        print(f"[{idx}/{len(URLS)}] {target['make']} {target['model']}")
-        print(f"    {target['url']}")
-
-        try:
-            page = context.new_page()
-            start = time.time()
-
-            response = page.goto(target['url'], wait_until='domcontentloaded', timeout=30000)
-            load_time = time.time() - start
-
-            html = page.content()
-
-            print(f"    Status: {response.status} | Time: {load_time:.1f}s | Size: {len(html):,}")
-
-            # Parse
-            listings = parse_bidfax_listings(html, target['url'])
-            print(f"    Listings: {len(listings)}")
-
-            if listings:
-                first = listings[0]
-                print(f"    Sample: {first.get('vin', 'N/A')[:10]}... | "
-                      f"${first.get('sold_price', 0):,} | {first.get('lot_id', 'N/A')}")
-
-            all_results.append({
-                'url': target['url'],
-                'make': target['make'],
-                'model': target['model'],
-                'status': response.status,
-                'load_time': load_time,
-                'listings_count': len(listings),
-                'listings': listings
-            })
-
-            page.close()
-            time.sleep(2)  # Delay between pages
-
-        except Exception as e:
-            print(f"    ERROR: {e}")
-
-        print()
-
-    browser.close()
-
-# Save
-output_file = f"scraped_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-with open(output_file, 'w') as f:
-    json.dump(all_results, f, indent=2)
-
-total = sum(r['listings_count'] for r in all_results)
-
-print("=" * 80)
-print("COMPLETE")
-print("=" * 80)
-print(f"\nTotal listings: {total}")
-print(f"Saved to: {output_file}\n")
-
-print("Summary:")
-print("-" * 50)
-for r in all_results:
-    print(f"{r['make']:12} {r['model']:15} | {r['listings_count']:3} listings")
-print("-" * 50)
+async def fetch_http(client, target):
+    """GET one URL over the shared client; returns (status, html, load_time, via)."""
+    start = time.time()
+    response = await client.get(target['url'])
+    return response.status_code, response.text, time.time() - start, 'http'
+
+
+async def fetch_browser(pages, target):
+    """Load one URL in a tab borrowed from the pool; returns (status, html, load_time, via)."""
+    page = await pages.get()
+    try:
+        start = time.time()
+        response = await page.goto(target['url'], wait_until='domcontentloaded', timeout=30000)
+        load_time = time.time() - start
+
+        html = await page.content()
+    finally:
+        pages.put_nowait(page)
+    return response.status, html, load_time, 'browser'
+
+
+async def fetch_with_browser(targets):
+    """Fetch the given URLs concurrently in one visual browser session."""
+    async with async_playwright() as p:
+        logger.info(f"Launching browser for {len(targets)} challenged page(s)...")
+        browser = await p.chromium.launch(
+            headless=False,  # VISUAL!
+            args=[
+                '--disable-blink-features=AutomationControlled',
+                '--no-sandbox',
+            ],
+        )
+
+        context = await browser.new_context(
+            user_agent=USER_AGENT,
+            viewport={'width': 1920, 'height': 1080},
+        )
+
+        # Block heavy resources for every tab in the context
+        await context.route("**/*", block_heavy_resources)
+
+        # Inject cookies
+        cookie_list = parse_cookies(COOKIE_DOMAIN, COOKIES)
+        await context.add_cookies(cookie_list)
+        logger.info(f"Injected {len(cookie_list)} cookies\n")
+
+        # Open the tabs once; closing the browser closes them
+        pages = asyncio.Queue()
+        for _ in range(min(len(targets), BROWSER_TABS)):
+            pages.put_nowait(await context.new_page())
+
+        fetched = await asyncio.gather(
+            *(fetch_browser(pages, target) for target in targets),
+            return_exceptions=True,
+        )
+
+        await browser.close()
+
+    return fetched
+
+
+def report(idx, target, fetched):
+    """Log one URL's outcome in a single record and build its result entry; None if the fetch failed."""
+    header = f"[{idx}/{len(URLS)}] {target['make']} {target['model']}\n    {target['url']}"
+
+    if isinstance(fetched, Exception):
+        logger.error(f"{header}\n    ERROR: {fetched}\n")
+        return None
+
+    status, html, load_time, via = fetched
+    lines = [header, f"    Status: {status} ({via}) | Time: {load_time:.1f}s | Size: {len(html):,}"]
+
+    # Parse
+    listings = parse_bidfax_listings(html, target['url'])
+    lines.append(f"    Listings: {len(listings)}")
+
+    if listings:
+        first = listings[0]
+        lines.append(f"    Sample: {first.get('vin', 'N/A')[:10]}... | "
+                     f"${first.get('sold_price', 0):,} | {first.get('lot_id', 'N/A')}")
+    lines.append("")
+    logger.info("\n".join(lines))
+
+    return {
+        'url': target['url'],
+        'make': target['make'],
+        'model': target['model'],
+        'status': status,
+        'load_time': load_time,
+        'listings_count': len(listings),
+        'listings': listings
+    }
+
+
+async def main():
+    logger.info("\n".join([
+        "=" * 80,
+        "VISUAL BROWSER SCRAPER - 5 URLs",
+        "=" * 80,
+        "",
+        "Features:",
+        "  - HTTP/2 fetch with cookie injection (Cloudflare bypass)",
+        "  - VISUAL browser fallback for challenged pages (watch it work!)",
+        "  - Production parsing logic",
+        "  - 2Captcha ready (if challenge appears)",
+        "",
+    ]))
+
+    # One pooled HTTP/2 connection serves all URLs; no browser while the cookie is valid
+    cookies = httpx.Cookies()
+    for cookie in parse_cookies(COOKIE_DOMAIN, COOKIES):
+        cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie['path'])
+
+    async with httpx.AsyncClient(
+        http2=True,
+        cookies=cookies,
+        # Listing pages compress ~5x; httpx decodes br via the brotli extra
+        headers={'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip, br'},
+        follow_redirects=True,
+        timeout=30.0,
+    ) as client:
+        fetched = await asyncio.gather(
+            *(fetch_http(client, target) for target in URLS),
+            return_exceptions=True,
+        )
+
+    # Re-fetch challenged pages in the browser so the JS challenge can resolve
+    challenged = [
+        i for i, f in enumerate(fetched)
+        if not isinstance(f, Exception) and f[0] in CHALLENGE_STATUSES
+    ]
+    if challenged:
+        retried = await fetch_with_browser([URLS[i] for i in challenged])
+        for i, f in zip(challenged, retried):
+            fetched[i] = f
+
+    # Save: stream each result into the JSON array as it is parsed; only summaries stay in memory
+    output_file = f"scraped_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    all_results = []
+    with open(output_file, 'wb') as f:
+        f.write(b'[')
+        for idx, (target, outcome) in enumerate(zip(URLS, fetched), 1):
+            result = report(idx, target, outcome)
+            if result is None:
+                continue
+            # Pretty-printed like the old json.dump(indent=2): each record is indented
+            # one level inside the array (JSON strings never contain raw newlines)
+            record = orjson.dumps(result, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  ')
+            f.write((b',\n  ' if all_results else b'\n  ') + record)
+            del result['listings']
+            all_results.append(result)
+        f.write(b'\n]\n')
+
+    total = sum(r['listings_count'] for r in all_results)
+
+    lines = [
+        "=" * 80,
+        "COMPLETE",
+        "=" * 80,
+        f"\nTotal listings: {total}",
+        f"Saved to: {output_file}\n",
+        "Summary:",
+        "-" * 50,
+    ]
+    for r in all_results:
+        lines.append(f"{r['make']:12} {r['model']:15} | {r['listings_count']:3} listings")
+    lines.append("-" * 50)
+    logger.info("\n".join(lines))
+
+
+if __name__ == "__main__":
+    # Plain progress messages on stderr, one record per URL and per banner/summary block
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stderr)
+    # The per-URL record already reports status; skip httpx's per-request INFO lines
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+    asyncio.run(main())
@@ -2,17 +2,34 @@
 BidFax Multi-URL Scraper - Scrape 5 Different Vehicle Pages
 
 This script will:
-1. Scrape 5 different BidFax URLs
+1. Scrape 5 different BidFax URLs over HTTP/2 (browser only for challenged pages)
 2. Use your cookies for Cloudflare bypass
 3. Parse auction listings from each page
 4. Save results to JSON file
 """
 
-import json
+import asyncio
+import logging
+import re
+import sys
 import time
 from datetime import datetime
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+from urllib.parse import urlparse
+import httpx
+import orjson
+from playwright.async_api import async_playwright
+from selectolax.lexbor import LexborHTMLParser
+
+logger = logging.getLogger(__name__)
+
+_VIN_RE = re.compile(r'\b[A-HJ-NPR-Z0-9]{17}\b')
+_PRICE_RE = re.compile(r'\$?([\d,]+)')
+_MILES_RE = re.compile(r'(\d+)\s*miles', re.IGNORECASE)
+# VIN alphabet excludes I, O, Q to avoid confusion with 1, 0
+_VIN_EXCLUDED_CHARS = frozenset('IOQ')
+
+# Card selector; every field inside a card comes from one walk (card_to_soa)
+_SEL_CARDS = 'div.thumbnail.offer'
 
 # Your BidFax cookies
 COOKIES = (
@@ -28,6 +45,15 @@ COOKIES = (
     "_ga_X74XC43NFG=GS2.2.s1766299998$o4$g1$t1766300004$j54$l0$h0"
 )
 
+# cf_clearance is bound to the user agent that earned it; HTTP and browser must match
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Cloudflare answers a challenge with these instead of the listing page
+CHALLENGE_STATUSES = (403, 503)
+
+# Tabs kept open for browser fallback fetches; URLs take turns on them
+BROWSER_TABS = 3
+
 # 5 URLs to scrape
 URLS_TO_SCRAPE = [
     {
@@ -57,84 +83,172 @@ URLS_TO_SCRAPE = [
     }
 ]
 
+# Every URL is on the same host, so the cookies are scoped to it once
+COOKIE_DOMAIN = urlparse(URLS_TO_SCRAPE[0]['url']).hostname
 
-def parse_cookies(url, cookie_string):
-    """Parse cookie string into Playwright format."""
-    from urllib.parse import urlparse
 
-    parsed_url = urlparse(url)
-    domain = parsed_url.hostname
+async def block_heavy_resources(route):
+    """Abort subresources the parser never reads; documents, scripts and XHR still load."""
+    if route.request.resource_type in ("image", "font", "media", "stylesheet"):
+        await route.abort()
+    else:
+        await route.continue_()
 
-    cookies = []
-    for cookie in cookie_string.split(';'):
-        cookie = cookie.strip()
-        if '=' not in cookie:
-            continue
 
-        name, value = cookie.split('=', 1)
-        cookies.append({
-            'name': name.strip(),
-            'value': value.strip(),
-            'domain': domain,
-            'path': '/',
-        })
+# Parsed cookie lists keyed by (domain, cookie_string); the HTTP and browser paths share one
+_COOKIE_CACHE = {}
 
+
+def parse_cookies(domain, cookie_string):
+    """Parse cookie string into Playwright format (cached per domain and cookie string)."""
+    key = (domain, cookie_string)
+    cookies = _COOKIE_CACHE.get(key)
+    if cookies is None:
+        cookies = _COOKIE_CACHE[key] = [
+            {'name': name.strip(), 'value': value.strip(), 'domain': domain, 'path': '/'}
+            for name, sep, value in (c.partition('=') for c in cookie_string.split(';'))
+            if sep
+        ]
     return cookies
 
 
+def extract_vin(title_text):
+    """First 17-char VIN in a card title; plain tokens are checked before the regex."""
+    for token in title_text.split():
+        if (
+            len(token) == 17
+            and token.isascii()
+            and token.isalnum()
+            and token == token.upper()
+            and not _VIN_EXCLUDED_CHARS.intersection(token)
+        ):
+            return token
+    vin_match = _VIN_RE.search(title_text)
+    return vin_match.group(0) if vin_match else None
+
+
+def parse_price(price_text):
+    """Whole dollars from text like '$12,500'; regex only for unusual formats."""
+    parts = price_text.lstrip('$').replace(',', '').split(None, 1)
+    head = parts[0] if parts else ''
+    if head.isdecimal():
+        return int(head)
+    price_match = _PRICE_RE.search(price_text)
+    return int(price_match.group(1).replace(',', '')) if price_match else None
+
+
+def parse_odometer(text):
+    """Miles from text like '178424 miles', or None; regex only for unusual formats."""
+    idx = text.lower().find('miles')
+    if idx < 0:
+        return None
+    before = text[:idx].rstrip()
+    number = before.rsplit(None, 1)[-1] if before else ''
+    if number.isdecimal():
+        return int(number)
+    odometer_match = _MILES_RE.search(text)
+    return int(odometer_match.group(1)) if odometer_match else None
+
+
+def card_to_soa(card):
+    """
+    Pre-extract every field source of a card in one pre-order walk.
+
+    Returns the VIN from the first h2, the price text, the first img alt,
+    auction-source flags, the first odometer reading, and labels mapping
+    lowercased label text ('lot number:', 'damage:', ...) to span.blackfont
+    values. Each span.blackfont is keyed by the nearest non-blank text before
+    it; first occurrence wins. Returns None for cards without a VIN (ads,
+    placeholders), stopping at their h2 when they have one.
+    """
+    soa = {
+        'vin': None,
+        'price': None,
+        'img_alt': None,
+        'copart': False,
+        'iaai': False,
+        'odometer': None,
+        'labels': {},
+    }
+    labels = soa['labels']
+    last_text = ''
+    seen_h2 = False
+    for node in card.traverse(include_text=True):
+        tag = node.tag
+        if tag == '-text':
+            text = node.text(deep=False).strip()
+            if text:
+                last_text = text
+                if soa['odometer'] is None:
+                    soa['odometer'] = parse_odometer(text)
+        elif tag == 'span':
+            classes = (node.attributes.get('class') or '').split()
+            if 'blackfont' in classes:
+                labels.setdefault(last_text.lower(), node.text(deep=True).strip())
+            if 'prices' in classes and soa['price'] is None:
+                soa['price'] = node.text(deep=True).strip()
+            if 'copart' in classes:
+                soa['copart'] = True
+            if 'iaai' in classes:
+                soa['iaai'] = True
+        elif tag == 'h2':
+            if not seen_h2:
+                seen_h2 = True
+                soa['vin'] = extract_vin(node.text(deep=True))
+                if not soa['vin']:
+                    return None
+        elif tag == 'img':
+            if soa['img_alt'] is None and 'alt' in node.attributes:
+                soa['img_alt'] = (node.attributes['alt'] or '').lower()
+    return soa if soa['vin'] else None
+
+
 def parse_bidfax_listings(html, url):
     """Parse BidFax HTML to extract auction listings."""
-    soup = BeautifulSoup(html, 'html.parser')
+    if not html or not html.strip():
+        return []
+
+    tree = LexborHTMLParser(html)
 
     listings = []
 
     # Find all listing cards (div.thumbnail.offer)
-    cards = soup.find_all('div', class_='thumbnail offer')
+    cards = tree.css(_SEL_CARDS)
 
     for card in cards:
         try:
+            # VIN - from h2 title; cards without one (ads, placeholders) are skipped
+            soa = card_to_soa(card)
+            if soa is None:
+                continue
+            labels = soa['labels']
+
             listing = {
                 'source_url': url,
-                'scraped_at': datetime.now().isoformat()
+                'scraped_at': datetime.now().isoformat(),
+                'vin': soa['vin'],
             }
 
-            # VIN - from h2 title (regex extraction)
-            h2 = card.find('h2')
-            if h2:
-                title_text = h2.get_text()
-                import re
-                vin_match = re.search(r'\b[A-HJ-NPR-Z0-9]{17}\b', title_text)
-                if vin_match:
-                    listing['vin'] = vin_match.group(0)
-
             # Price - span.prices
-            price_span = card.find('span', class_='prices')
-            if price_span:
-                price_text = price_span.get_text().strip()
+            if soa['price'] is not None:
                 # Extract number from "$25,000" format
-                price_match = re.search(r'\$?([\d,]+)', price_text)
-                if price_match:
-                    listing['sold_price'] = int(price_match.group(1).replace(',', ''))
+                sold_price = parse_price(soa['price'])
+                if sold_price is not None:
+                    listing['sold_price'] = sold_price
 
             # Lot ID - "Lot number:" label + span.blackfont
-            lot_label = card.find(string=re.compile(r'Lot number:', re.IGNORECASE))
-            if lot_label:
-                lot_span = lot_label.find_next('span', class_='blackfont')
-                if lot_span:
-                    listing['lot_id'] = lot_span.get_text().strip()
+            if 'lot number:' in labels:
+                listing['lot_id'] = labels['lot number:']
 
             # Auction Source - span.copart or span.iaai
-            copart = card.find('span', class_='copart')
-            iaai = card.find('span', class_='iaai')
-            if copart:
+            if soa['copart']:
                 listing['auction_source'] = 'copart'
-            elif iaai:
+            elif soa['iaai']:
                 listing['auction_source'] = 'iaai'
 
             # Sale Status - img[alt] (Sold/On approval/No sale)
-            status_img = card.find('img', alt=True)
-            if status_img:
-                alt_text = status_img['alt'].lower()
+            alt_text = soa['img_alt']
+            if alt_text is not None:
                 if 'sold' in alt_text:
                     listing['sale_status'] = 'sold'
                 elif 'approval' in alt_text:
@@ -143,169 +257,225 @@ def parse_bidfax_listings(html, url):
                     listing['sale_status'] = 'not_sold'
 
             # Date - "Date of sale:" + DD.MM.YYYY
-            date_label = card.find(string=re.compile(r'Date of sale:', re.IGNORECASE))
-            if date_label:
-                date_span = date_label.find_next('span', class_='blackfont')
-                if date_span:
-                    listing['sale_date'] = date_span.get_text().strip()
+            if 'date of sale:' in labels:
+                listing['sale_date'] = labels['date of sale:']
 
             # Odometer - text with "miles"
-            odometer_text = card.find(string=re.compile(r'(\d+)\s*miles', re.IGNORECASE))
-            if odometer_text:
-                odometer_match = re.search(r'(\d+)\s*miles', odometer_text, re.IGNORECASE)
-                if odometer_match:
-                    listing['odometer'] = int(odometer_match.group(1))
+            if soa['odometer'] is not None:
+                listing['odometer'] = soa['odometer']
 
             # Damage - "Damage:" label + span.blackfont
-            damage_label = card.find(string=re.compile(r'Damage:', re.IGNORECASE))
-            if damage_label:
-                damage_span = damage_label.find_next('span', class_='blackfont')
-                if damage_span:
-                    listing['damage'] = damage_span.get_text().strip()
+            if 'damage:' in labels:
+                listing['damage'] = labels['damage:']
 
             # Condition - "Condition:" label + span.blackfont
-            condition_label = card.find(string=re.compile(r'Condition:', re.IGNORECASE))
-            if condition_label:
-                condition_span = condition_label.find_next('span', class_='blackfont')
-                if condition_span:
-                    listing['condition'] = condition_span.get_text().strip()
+            if 'condition:' in labels:
+                listing['condition'] = labels['condition:']
 
             # Location
-            location_label = card.find(string=re.compile(r'Location:', re.IGNORECASE))
-            if location_label:
-                location_span = location_label.find_next('span', class_='blackfont')
-                if location_span:
-                    listing['location'] = location_span.get_text().strip()
+            if 'location:' in labels:
+                listing['location'] = labels['location:']
 
-            # Only add if we got at least some data
-            if len(listing) > 2:  # More than just source_url and scraped_at
-                listings.append(listing)
+            listings.append(listing)
 
         except Exception as e:
-            print(f"   Error parsing card: {e}")
+            logger.warning(f"   Error parsing card: {e}")
             continue
 
     return listings
 
 
-print("=" * 80)
-print("BIDFAX MULTI-URL SCRAPER")
-print("=" * 80)
-print()
-print(f"Target URLs: {len(URLS_TO_SCRAPE)}")
-print(f"Cookies: {len(COOKIES)} characters")
-print()
-
-all_results = []
-total_listings = 0
-
-with sync_playwright() as p:
-    # Launch browser (headless for speed)
-    print("Launching browser...")
-    browser = p.chromium.launch(
-        headless=False,  # Set to True for faster scraping
-        args=[
-            '--disable-blink-features=AutomationControlled',
-            '--disable-dev-shm-usage',
-            '--no-sandbox',
-        ]
-    )
-
-    # Create context with cookies
-    context = browser.new_context(
-        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        viewport={'width': 1920, 'height': 1080},
-        locale='en-US',
-    )
-
-    # Inject cookies once
-    cookie_list = parse_cookies(URLS_TO_SCRAPE[0]['url'], COOKIES)
-    context.add_cookies(cookie_list)
-    print(f"Injected {len(cookie_list)} cookies")
-    print()
-
-    # Scrape each URL
-    for idx, target in enumerate(URLS_TO_SCRAPE, 1):
-        print(f"[{idx}/{len(URLS_TO_SCRAPE)}] Scraping: {target['make']} {target['model']}")
-        print(f"    URL: {target['url']}")
-
-        try:
-            # Create new page
-            page = context.new_page()
-
-            # Navigate
-            start_time = time.time()
-            response = page.goto(target['url'], wait_until='domcontentloaded', timeout=30000)
-            load_time = time.time() - start_time
-
-            print(f"    Status: {response.status} | Load time: {load_time:.2f}s")
-
-            # Get HTML
-            html = page.content()
-            print(f"    HTML size: {len(html):,} characters")
-
-            # Parse listings
-            listings = parse_bidfax_listings(html, target['url'])
-            print(f"    Listings found: {len(listings)}")
-
-            # Add to results
-            result = {
-                'url': target['url'],
-                'make': target['make'],
-                'model': target['model'],
-                'status': response.status,
-                'load_time': load_time,
-                'html_size': len(html),
-                'listings_count': len(listings),
-                'listings': listings,
-                'scraped_at': datetime.now().isoformat()
-            }
-            all_results.append(result)
-            total_listings += len(listings)
-
-            # Show first listing as sample
-            if listings:
-                first = listings[0]
-                print(f"    Sample: VIN={first.get('vin', 'N/A')[:10]}... | "
-                      f"Price=${first.get('sold_price', 0):,} | "
-                      f"Lot={first.get('lot_id', 'N/A')}")
-
-            page.close()
-            print()
-
-            # Small delay between requests
-            time.sleep(2)
+async def fetch_http(client, target):
+    """GET one URL over the shared client; returns (status, html, load_time, via)."""
+    start_time = time.time()
+    response = await client.get(target['url'])
+    return response.status_code, response.text, time.time() - start_time, 'http'
+
+
+async def fetch_browser(pages, target):
+    """Load one URL in a tab borrowed from the pool; returns (status, html, load_time, via)."""
+    page = await pages.get()
+    try:
+        # Navigate
+        start_time = time.time()
+        response = await page.goto(target['url'], wait_until='domcontentloaded', timeout=30000)
+        load_time = time.time() - start_time
+
+        # Get HTML
+        html = await page.content()
+    finally:
+        pages.put_nowait(page)
+    return response.status, html, load_time, 'browser'
+
+
+async def fetch_with_browser(targets):
+    """Fetch the given URLs concurrently in one browser session."""
+    async with async_playwright() as p:
+        logger.info(f"Launching browser for {len(targets)} challenged page(s)...")
+        browser = await p.chromium.launch(
+            headless=False,  # Set to True for faster scraping
+            args=[
+                '--disable-blink-features=AutomationControlled',
+                '--disable-dev-shm-usage',
+                '--no-sandbox',
+            ]
+        )
+
+        # Create context with cookies
+        context = await browser.new_context(
+            user_agent=USER_AGENT,
+            viewport={'width': 1920, 'height': 1080},
+            locale='en-US',
+        )
+
+        # Block heavy resources for every tab in the context
+        await context.route("**/*", block_heavy_resources)
+
+        # Inject cookies once
+        cookie_list = parse_cookies(COOKIE_DOMAIN, COOKIES)
+        await context.add_cookies(cookie_list)
+        logger.info(f"Injected {len(cookie_list)} cookies\n")
+
+        # Open the tabs once; closing the browser closes them
+        pages = asyncio.Queue()
+        for _ in range(min(len(targets), BROWSER_TABS)):
+            pages.put_nowait(await context.new_page())
+
+        fetched = await asyncio.gather(
+            *(fetch_browser(pages, target) for target in targets),
+            return_exceptions=True,
+        )
+
+        await browser.close()
+
+    return fetched
+
+
+def report(idx, target, fetched):
+    """Log one URL's outcome in a single record and build its result entry; None if the fetch failed."""
+    header = (f"[{idx}/{len(URLS_TO_SCRAPE)}] Scraping: {target['make']} {target['model']}\n"
+              f"    URL: {target['url']}")
+
+    if isinstance(fetched, Exception):
+        logger.error(f"{header}\n    ERROR: {fetched}\n")
+        return None
+
+    status, html, load_time, via = fetched
+    lines = [
+        header,
+        f"    Status: {status} ({via}) | Load time: {load_time:.2f}s",
+        f"    HTML size: {len(html):,} characters",
+    ]
+
+    # Parse listings
+    listings = parse_bidfax_listings(html, target['url'])
+    lines.append(f"    Listings found: {len(listings)}")
+
+    # Show first listing as sample
+    if listings:
+        first = listings[0]
+        lines.append(f"    Sample: VIN={first.get('vin', 'N/A')[:10]}... | "
+                     f"Price=${first.get('sold_price', 0):,} | "
+                     f"Lot={first.get('lot_id', 'N/A')}")
+    lines.append("")
+    logger.info("\n".join(lines))
+
+    return {
+        'url': target['url'],
+        'make': target['make'],
+        'model': target['model'],
+        'status': status,
+        'load_time': load_time,
+        'html_size': len(html),
+        'listings_count': len(listings),
+        'listings': listings,
+        'scraped_at': datetime.now().isoformat()
+    }
 
-        except Exception as e:
-            print(f"    ERROR: {e}")
-            print()
-            continue
 
-    browser.close()
-
-# Save results to JSON
-output_file = f"bidfax_scrape_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-with open(output_file, 'w', encoding='utf-8') as f:
-    json.dump(all_results, f, indent=2, ensure_ascii=False)
-
-print("=" * 80)
-print("SCRAPING COMPLETE")
-print("=" * 80)
-print()
-print(f"URLs scraped: {len(all_results)}/{len(URLS_TO_SCRAPE)}")
-print(f"Total listings: {total_listings}")
-print(f"Results saved to: {output_file}")
-print()
-
-# Show summary table
-print("Summary:")
-print("-" * 80)
-for result in all_results:
-    print(f"{result['make']:12} {result['model']:20} | "
-          f"{result['listings_count']:3} listings | "
-          f"Status: {result['status']} | "
-          f"{result['load_time']:.1f}s")
-print("-" * 80)
-print()
-print(f"Total listings scraped: {total_listings}")
-print()
+async def main():
+    logger.info("\n".join([
+        "=" * 80,
+        "BIDFAX MULTI-URL SCRAPER",
+        "=" * 80,
+        "",
+        f"Target URLs: {len(URLS_TO_SCRAPE)}",
+        f"Cookies: {len(COOKIES)} characters",
+        "",
+    ]))
+
+    # One pooled HTTP/2 connection serves all URLs; no browser while the cookie is valid
+    cookies = httpx.Cookies()
+    for cookie in parse_cookies(COOKIE_DOMAIN, COOKIES):
+        cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie['path'])
+
+    async with httpx.AsyncClient(
+        http2=True,
+        cookies=cookies,
+        # Listing pages compress ~5x; httpx decodes br via the brotli extra
+        headers={'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip, br'},
+        follow_redirects=True,
+        timeout=30.0,
+    ) as client:
+        fetched = await asyncio.gather(
+            *(fetch_http(client, target) for target in URLS_TO_SCRAPE),
+            return_exceptions=True,
+        )
+
+    # Re-fetch challenged pages in the browser so the JS challenge can resolve
+    challenged = [
+        i for i, f in enumerate(fetched)
+        if not isinstance(f, Exception) and f[0] in CHALLENGE_STATUSES
+    ]
+    if challenged:
+        retried = await fetch_with_browser([URLS_TO_SCRAPE[i] for i in challenged])
+        for i, f in zip(challenged, retried):
+            fetched[i] = f
+
+    # Save results to JSON: stream each result as it is parsed; only summaries stay in memory
+    output_file = f"bidfax_scrape_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    all_results = []
+    with open(output_file, 'wb') as f:
+        f.write(b'[')
+        for idx, (target, outcome) in enumerate(zip(URLS_TO_SCRAPE, fetched), 1):
+            result = report(idx, target, outcome)
+            if result is None:
+                continue
+            # orjson writes UTF-8 directly, like the old ensure_ascii=False
+            # Pretty-printed like the old json.dump(indent=2): each record is indented
+            # one level inside the array (JSON strings never contain raw newlines)
+            record = orjson.dumps(result, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  ')
+            f.write((b',\n  ' if all_results else b'\n  ') + record)
+            del result['listings']
+            all_results.append(result)
+        f.write(b'\n]\n')
+    total_listings = sum(r['listings_count'] for r in all_results)
+
+    lines = [
+        "=" * 80,
+        "SCRAPING COMPLETE",
+        "=" * 80,
+        "",
+        f"URLs scraped: {len(all_results)}/{len(URLS_TO_SCRAPE)}",
+        f"Total listings: {total_listings}",
+        f"Results saved to: {output_file}",
+        "",
+        # Summary table
+        "Summary:",
+        "-" * 80,
+    ]
+    for result in all_results:
+        lines.append(f"{result['make']:12} {result['model']:20} | "
+                     f"{result['listings_count']:3} listings | "
+                     f"Status: {result['status']} | "
+                     f"{result['load_time']:.1f}s")
+    lines += ["-" * 80, "", f"Total listings scraped: {total_listings}", ""]
+    logger.info("\n".join(lines))
+
+
+if __name__ == "__main__":
+    # Plain progress messages on stderr, one record per URL and per banner/summary block
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stderr)
+    # The per-URL record already reports status; skip httpx's per-request INFO lines
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+    asyncio.run(main())